@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from voice_assistant import main
+
+# typed the way the baseline line parser typed it: true/false -> bool, an empty
+# value -> list (filled by "- item" lines), anything else a plain string
+CONFIG_TEXT = """# comment
+wake_word: yes
+allow_execution: false
+flag: TRUE
+mode: On
+count: 3
+ratio: 0.5
+empty:
+allowed_commands:
+  - open_url
+  - no
+  - 1
+  # indented comment
+tail: null
+"""
+EXPECTED = {
+    "wake_word": "yes",
+    "allow_execution": False,
+    "flag": True,
+    "mode": "On",
+    "count": "3",
+    "ratio": "0.5",
+    "empty": [],
+    "allowed_commands": ["open_url", "no", "1"],
+    "tail": "null",
+}
+
+PARSERS = [pytest.param(False, id="line-parser")]
+if main.HAS_YAML:
+    PARSERS.append(pytest.param(True, id="yaml"))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    p = tmp_path / "config.yaml"
+    p.write_text(CONFIG_TEXT, encoding="utf-8")
+    return p
+
+
+@pytest.mark.parametrize("use_yaml", PARSERS)
+def test_parse_config_types_match_baseline(config_file, monkeypatch, use_yaml):
+    monkeypatch.setattr(main, "HAS_YAML", use_yaml)
+    assert main._parse_config(config_file) == EXPECTED
+
+
+@pytest.mark.parametrize("use_yaml", PARSERS)
+def test_parse_config_shipped_config(monkeypatch, use_yaml):
+    monkeypatch.setattr(main, "HAS_YAML", use_yaml)
+    cfg = main._parse_config(main.CONFIG_PATH)
+    assert cfg["allowed_commands"] == ["open_url", "open_app", "tell_time"]
+    assert cfg["always_listen"] is True
+    assert cfg["llm_model"] == "phi3"
+
+
+@pytest.mark.skipif(not main.HAS_YAML, reason="PyYAML not installed")
+def test_yaml_unquotes_strings(tmp_path):
+    # the one intended difference: real YAML strips quotes the line parser keeps
+    p = tmp_path / "config.yaml"
+    p.write_text('llm_model: "phi3"\n', encoding="utf-8")
+    assert main._parse_config(p) == {"llm_model": "phi3"}
+
+
+def test_load_config_caches_by_mtime_and_copies(config_file):
+    a = main.load_config(config_file)
+    a["allowed_commands"].append("rm")
+    a["extra"] = True
+    b = main.load_config(config_file)
+    assert b == EXPECTED
+    config_file.write_text("wake_word: hi\n", encoding="utf-8")
+    st = config_file.stat()
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert main.load_config(config_file) == {"wake_word": "hi"}
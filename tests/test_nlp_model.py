@@ -0,0 +1,176 @@
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from voice_assistant import nlp_model
+
+
+def _parse(text, config=None):
+    return nlp_model._rule_based_parse(text, config or {})
+
+
+@pytest.mark.parametrize("text", ["what time is it", "whats the time", "time, what is it", "what's the time now"])
+def test_tell_time_matches_both_words_anywhere(text):
+    assert _parse(text)["intent"] == "tell_time"
+
+
+@pytest.mark.parametrize("text, intent, entities", [
+    ("open spotify and xbox", "open_app", {"app": {"type": "protocol", "value": "xbox:"}}),
+    ("open steam github", "open_url", {"url": "https://github.com"}),
+    ("open linkedin then steam", "open_url", {"url": "https://www.linkedin.com"}),
+    ("open xbox", "open_app", {"app": {"type": "protocol", "value": "xbox:"}}),
+    ("open the mic store", "open_app", {"app": {"type": "protocol", "value": "ms-windows-store://home"}}),
+    ("open spotify", "open_app", {"app": {"type": "app", "value": "spotify"}}),
+    ("open chrome", "open_app", {"app": {"type": "app", "value": "chrome"}}),
+    ("open the browser", "open_app", {"app": {"type": "app", "value": "msedge"}}),
+    ("open githubs", "unknown", {}),
+])
+def test_open_matches_follow_table_order(text, intent, entities):
+    assert _parse(text) == {"intent": intent, "entities": entities}
+
+
+class _FakeServer:
+    """Raw-socket stand-in for `ollama serve` on an ephemeral port.
+
+    `mode` is "close" (answer, then drop the connection without saying so), "drop"
+    (close before answering) or "hang" (read the request, never answer).
+    """
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.requests = 0
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(8)
+        self.port = self.sock.getsockname()[1]
+        self._held = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                c, _ = self.sock.accept()
+            except OSError:
+                return
+            if not c.recv(65536):
+                c.close()
+                continue
+            self.requests += 1
+            if self.mode == "hang":
+                self._held.append(c)
+                continue
+            if self.mode == "close":
+                body = json.dumps({"response": "ok%d" % self.requests}).encode()
+                c.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            c.close()
+
+    def close(self):
+        self.sock.close()
+        for c in self._held:
+            c.close()
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    servers = []
+
+    def start(mode):
+        srv = _FakeServer(mode)
+        servers.append(srv)
+        monkeypatch.setattr(nlp_model, "_OLLAMA_PORT", srv.port)
+        monkeypatch.setattr(nlp_model, "_http_conn", None)
+        return srv
+
+    yield start
+    if nlp_model._http_conn is not None:
+        nlp_model._http_conn.close()
+    for srv in servers:
+        srv.close()
+
+
+def test_post_ollama_retries_a_stale_kept_alive_connection(fake_server):
+    srv = fake_server("close")
+    assert nlp_model._post_ollama(b'"hi"') == "ok1"
+    # the server dropped the kept-alive connection; the request is resent once, fresh
+    assert nlp_model._post_ollama(b'"hi"') == "ok2"
+    assert srv.requests == 2
+
+
+def test_post_ollama_does_not_retry_a_fresh_connection(fake_server):
+    srv = fake_server("drop")
+    assert nlp_model._post_ollama(b'"hi"') is None
+    assert srv.requests == 1
+
+
+def test_post_ollama_timeout_is_not_resent(fake_server):
+    srv = fake_server("hang")
+    assert nlp_model._post_ollama(b'"hi"', timeout=0.3) is nlp_model._SERVER_FAILED
+    time.sleep(0.1)
+    assert srv.requests == 1
+
+
+def test_call_ollama_skips_the_cli_after_a_timeout(fake_server, monkeypatch):
+    fake_server("hang")
+    cli_runs = []
+    monkeypatch.setattr(nlp_model, "_run_streaming", lambda *a: cli_runs.append(a) or (b"", b""))
+    assert nlp_model._call_ollama_bytes(b"hi", b'"hi"', timeout=0.3, ollama_exec="ollama") == ""
+    assert cli_runs == []
+
+
+def test_post_ollama_unreachable_server(monkeypatch):
+    s = socket.socket()
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    monkeypatch.setattr(nlp_model, "_OLLAMA_PORT", port)
+    monkeypatch.setattr(nlp_model, "_http_conn", None)
+    assert nlp_model._post_ollama(b'"hi"') is None
+
+
+def _py(code):
+    return [sys.executable, "-c", code]
+
+
+streaming = pytest.mark.skipif(sys.platform == "win32", reason="_run_streaming is POSIX-only")
+
+
+@streaming
+def test_run_streaming_stops_at_the_first_complete_json():
+    # the "model" keeps talking for 30 s after its answer
+    code = "import sys, time; sys.stdout.write('x {\"intent\": \"tell_time\"} more'); sys.stdout.flush(); time.sleep(30)"
+    t = time.monotonic()
+    out, err = nlp_model._run_streaming(_py(code), b"prompt", 10)
+    assert time.monotonic() - t < 5
+    assert nlp_model._extract_json(out.decode()) == {"intent": "tell_time"}
+
+
+@streaming
+def test_run_streaming_reads_to_eof_without_json():
+    code = "import sys; data = sys.stdin.read(); print('echo:', data); print('oops', file=sys.stderr)"
+    out, err = nlp_model._run_streaming(_py(code), b"hello", 10)
+    assert out.strip() == b"echo: hello"
+    assert err.strip() == b"oops"
+
+
+@streaming
+def test_run_streaming_drains_a_chatty_stderr():
+    # more than a pipe buffer of stderr before the answer must not block the child
+    code = "import sys; sys.stderr.write('e' * 200000); sys.stderr.flush(); print('{\"a\": 1}')"
+    out, err = nlp_model._run_streaming(_py(code), b"", 10)
+    assert b'{"a": 1}' in out
+    # drained past the 64 KiB pipe buffer; the rest is dropped once the JSON is in
+    assert 65536 < len(err) <= 200000 and set(err) == {ord("e")}
+
+
+@streaming
+def test_run_streaming_times_out_when_nothing_usable_arrives():
+    code = "import time; print('thinking', flush=True); time.sleep(30)"
+    t = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        nlp_model._run_streaming(_py(code), b"", 0.5)
+    assert time.monotonic() - t < 5
@@ -0,0 +1,209 @@
+import array
+import math
+import random
+
+import pytest
+
+from voice_assistant import stt
+
+RATE = 16000
+FRAME = int(RATE * stt._VAD_FRAME_SEC)
+FRAME_BYTES = FRAME * 2
+
+
+def _noise(sec, rms, seed=1):
+    rnd = random.Random(seed)
+    n = int(RATE * sec)
+    return array.array("h", (max(-32768, min(32767, int(rnd.gauss(0, rms)))) for _ in range(n)))
+
+
+def _tone(sec, rms, hz=300):
+    n = int(RATE * sec)
+    amp = rms * math.sqrt(2)
+    return array.array("h", (int(amp * math.sin(2 * math.pi * hz * i / RATE)) for i in range(n)))
+
+
+def _mix(a, b):
+    return array.array("h", (max(-32768, min(32767, x + y)) for x, y in zip(a, b)))
+
+
+def _feed_blocks(gate, pcm):
+    """Feed `pcm` in 20 ms blocks; return (bytes passed on, number of utterance ends)."""
+    data = pcm.tobytes()
+    passed = ends = 0
+    for i in range(0, len(data), FRAME_BYTES):
+        out, ended = gate.feed(data[i:i + FRAME_BYTES])
+        passed += len(out)
+        ends += ended
+    return passed, ends
+
+
+def test_pcm_ring_rejects_non_power_of_two():
+    with pytest.raises(ValueError):
+        stt._PcmRing(1000)
+
+
+def test_pcm_ring_reads_across_the_wrap():
+    ring = stt._PcmRing(16)
+    ring.write(bytes(range(10)))
+    assert bytes(ring.read()) == bytes(range(10))
+    # 10 more bytes: 6 fit before the end, 4 wrap to the start
+    ring.write(bytes(range(10, 20)))
+    out = ring.read()
+    assert isinstance(out, bytes)
+    assert out == bytes(range(10, 20))
+    assert ring.read() == b""
+
+
+def test_pcm_ring_contiguous_read_is_a_view():
+    ring = stt._PcmRing(16)
+    ring.write(b"abcd")
+    out = ring.read()
+    assert isinstance(out, memoryview)
+    assert bytes(out) == b"abcd"
+
+
+def test_pcm_ring_drops_audio_older_than_one_ring():
+    ring = stt._PcmRing(16)
+    ring.write(bytes(range(12)))
+    ring.write(bytes(range(12, 24)))
+    # the consumer fell behind: only the newest ring's worth survives
+    assert bytes(ring.read()) == bytes(range(8, 24))
+    # a single write larger than the ring keeps its tail
+    ring.write(bytes(range(40)))
+    assert bytes(ring.read()) == bytes(range(24, 40))
+
+
+def test_pcm_ring_sets_ready_on_write():
+    ring = stt._PcmRing(16)
+    assert not ring.ready.is_set()
+    ring.write(b"xy")
+    assert ring.ready.is_set()
+
+
+@pytest.mark.parametrize("noise_rms", [50, 150, 250, 400])
+def test_energy_vad_adapts_to_room_noise(noise_rms):
+    # 2 s of room noise, 0.5 s of speech over it, 2 s of noise again
+    gate = stt._SpeechGate(stt._energy_vad(), FRAME)
+    pcm = _noise(2.0, noise_rms, seed=1)
+    pcm += _mix(_tone(0.5, 3000), _noise(0.5, noise_rms, seed=2))
+    pcm += _noise(2.0, noise_rms, seed=3)
+    passed, ends = _feed_blocks(gate, pcm)
+    assert ends == 1
+    assert not gate.in_speech
+    # pre-roll + speech + trailing silence, not the whole recording
+    expected = (stt._VAD_PREROLL + 25 + stt._VAD_END_FRAMES) * FRAME_BYTES
+    assert abs(passed - expected) <= 4 * FRAME_BYTES
+
+
+def test_energy_vad_follows_a_louder_room():
+    gate = stt._SpeechGate(stt._energy_vad(), FRAME)
+    _feed_blocks(gate, _noise(1.0, 100, seed=4))
+    # a fan comes on (4x RMS); within a few seconds it is background again
+    _feed_blocks(gate, _noise(4.0, 400, seed=5))
+    passed, ends = _feed_blocks(gate, _noise(1.0, 400, seed=6))
+    assert passed == 0
+    assert not gate.in_speech
+
+
+def test_energy_vad_keeps_long_speech_in_one_utterance():
+    gate = stt._SpeechGate(stt._energy_vad(), FRAME)
+    _feed_blocks(gate, _noise(1.0, 200, seed=7))
+    passed, ends = _feed_blocks(gate, _mix(_tone(3.0, 3000), _noise(3.0, 200, seed=8)))
+    assert ends == 0 and gate.in_speech
+    assert passed >= 150 * FRAME_BYTES
+
+
+# gate tests use a fake VAD: frames whose samples are >= 1000 are speech, and each
+# frame is filled with one marker value so the order of the output can be checked
+def _marker_gate():
+    return stt._SpeechGate(lambda frame: frame[0] >= 1000, FRAME)
+
+
+def _frames(*markers):
+    return b"".join(array.array("h", [m] * FRAME).tobytes() for m in markers)
+
+
+def _markers(out):
+    samples = memoryview(bytes(out)).cast("h")
+    assert len(samples) % FRAME == 0
+    return [samples[i] for i in range(0, len(samples), FRAME)]
+
+
+def test_gate_holds_back_silence_as_preroll():
+    gate = _marker_gate()
+    out, ended = gate.feed(_frames(*range(1, 16)))
+    assert out == b"" and not ended
+    assert not gate.in_speech
+
+
+def test_gate_flushes_preroll_oldest_first_when_speech_starts():
+    gate = _marker_gate()
+    gate.feed(_frames(*range(1, 16)))
+    out, ended = gate.feed(_frames(1000, 1001))
+    pre = list(range(16 - stt._VAD_PREROLL, 16))
+    assert _markers(out) == pre + [1000, 1001]
+    assert gate.in_speech and not ended
+
+
+def test_gate_ends_utterance_after_trailing_silence():
+    gate = _marker_gate()
+    gate.feed(_frames(1000))
+    out, ended = gate.feed(_frames(*([5] * (stt._VAD_END_FRAMES - 1))))
+    assert not ended and gate.in_speech
+    # the post-roll silence still goes to the recognizer
+    assert len(_markers(out)) == stt._VAD_END_FRAMES - 1
+    out, ended = gate.feed(_frames(5))
+    assert ended and not gate.in_speech
+    # silence after the end is pre-roll again
+    out, ended = gate.feed(_frames(6))
+    assert out == b"" and not ended
+
+
+def test_gate_speech_resets_the_silence_run():
+    gate = _marker_gate()
+    gate.feed(_frames(1000, *([5] * (stt._VAD_END_FRAMES - 1)), 1001))
+    assert gate.silent_run == 0
+    out, ended = gate.feed(_frames(*([5] * (stt._VAD_END_FRAMES - 1))))
+    assert not ended and gate.in_speech
+
+
+def test_gate_only_passes_complete_frames():
+    gate = _marker_gate()
+    data = _frames(1000, 1001)
+    out, _ = gate.feed(data[:FRAME_BYTES + 10])
+    assert _markers(out) == [1000]
+    out, _ = gate.feed(data[FRAME_BYTES + 10:])
+    assert _markers(out) == [1001]
+
+
+def test_gate_grows_its_buffers_for_a_large_read():
+    gate = _marker_gate()
+    # well past the initial 64-frame capacity, in one feed, with pre-roll to flush
+    speech = [1000 + i for i in range(200)]
+    gate.feed(_frames(*range(1, 11)))
+    out, ended = gate.feed(_frames(*speech))
+    assert _markers(out) == list(range(1, 11)) + speech
+    assert not ended
+
+
+def test_gate_reuses_its_output_buffer():
+    gate = _marker_gate()
+    first, _ = gate.feed(_frames(1000, 1001))
+    buf = gate._out
+    second, _ = gate.feed(_frames(1002))
+    assert gate._out is buf
+    assert _markers(second) == [1002]
+
+
+def test_energy_vad_recovers_when_speech_starts_at_once():
+    # the user is already talking while the floor is seeded, so the floor starts out
+    # at speech level; the first short pause pulls it back down
+    gate = stt._SpeechGate(stt._energy_vad(), FRAME)
+    speech = _mix(_tone(0.5, 3000), _noise(0.5, 100, seed=9))
+    pause = _noise(0.04, 100, seed=10)
+    passed, _ = _feed_blocks(gate, speech + pause + speech + pause + speech)
+    assert gate.in_speech
+    # from the first pause on everything is passed, led by a full pre-roll; only
+    # the opening speech beyond the pre-roll is lost
+    assert passed == (stt._VAD_PREROLL + 25 + 2 + 25) * FRAME_BYTES
@@ -5,23 +5,22 @@ Allows running the assistant with:
 
 This avoids relative-import issues when running `main.py` directly inside the package folder.
 """
-from .main import run_interactive, run_test
+import functools
 import sys
 
+from ._argparser import build_parser, overrides_from_args
 
-def _parse_args(argv):
-    import argparse
 
-    parser = argparse.ArgumentParser(prog="python -m voice_assistant", description="Run the offline assistant (module entry)")
-    parser.add_argument("mode", nargs="?", choices=["run", "test"], default="run")
-    parser.add_argument("--allow-exec", dest="allow_exec", action="store_true", help="Allow executing system commands")
-    parser.add_argument("--allow-tts", dest="allow_tts", action="store_true", help="Enable TTS output (pyttsx3 required)")
-    parser.add_argument("--use-ollama", dest="use_ollama", action="store_true", help="Use local Ollama LLM for intent parsing")
-    parser.add_argument("--use-ollama-decider", dest="use_ollama_decider", action="store_true", help="Let the LLM decide actions (outputs JSON 'action' objects)")
-    parser.add_argument("--ollama-path", dest="ollama_path", type=str, help="Full path to ollama executable (overrides PATH)")
-    parser.add_argument("--llm-model", dest="llm_model", type=str, default="phi3", help="LLM model name to request from Ollama")
-    parser.add_argument("--always-listen", dest="always_listen", action="store_true", help="Disable wake word and process all input immediately")
-    parser.add_argument("--debug-llm", dest="debug_llm", action="store_true", help="Log raw LLM output to assist tuning")
+@functools.cache
+def _get_entrypoints():
+    """Import `voice_assistant.main` on first use and return its run functions."""
+    from .main import run_interactive, run_test
+
+    return run_interactive, run_test
+
+
+def _parse_args(argv):
+    parser = build_parser(prog="python -m voice_assistant", description="Run the offline assistant (module entry)")
     return parser.parse_args(argv)
 
 
@@ -29,6 +28,8 @@ def main(argv=None):
     argv = argv if argv is not None else sys.argv[1:]
     args = _parse_args(argv)
     config_overrides = {}
+    # notices are written in one go just before handing off to the runtime
+    startup_msgs = []
 
     # If the user invoked `python -m voice_assistant` with NO args (argv empty),
     # or with only the 'test' positional (no extra flags), default to using
@@ -36,35 +37,24 @@ def main(argv=None):
     # direct voice-driven assistant. Passing any explicit args will override
     # these defaults.
     if (not argv) or (len(argv) == 1 and argv[0] == "test"):
-        print("No CLI args (or only 'test') detected — enabling Ollama decider and execution by default.")
+        startup_msgs.append("No CLI args (or only 'test') detected — enabling Ollama decider and execution by default.")
         config_overrides["use_ollama"] = True
         config_overrides["use_ollama_decider"] = True
         config_overrides["allow_execution"] = True
         # keep TTS off by default (avoid unexpected audio); user can pass --allow-tts
     else:
-        if args.allow_exec:
-            config_overrides["allow_execution"] = True
-        if args.allow_tts:
-            config_overrides["allow_tts"] = True
-        if args.use_ollama:
-            config_overrides["use_ollama"] = True
-        if args.use_ollama_decider:
-            config_overrides["use_ollama_decider"] = True
-        if args.ollama_path:
-            config_overrides["ollama_path"] = args.ollama_path
-        if args.llm_model:
-            config_overrides["llm_model"] = args.llm_model
-        if args.always_listen:
-            config_overrides["always_listen"] = True
-        if args.debug_llm:
-            config_overrides["debug_llm"] = True
+        config_overrides = overrides_from_args(args)
 
         # If the Ollama decider is requested, implicitly enable execution
         # so the decider's chosen action will be performed instead of a dry-run.
         if config_overrides.get("use_ollama_decider") and not config_overrides.get("allow_execution"):
-            print("Ollama decider requested — enabling execution by default. Pass --allow-exec to control this.")
+            startup_msgs.append("Ollama decider requested — enabling execution by default. Pass --allow-exec to control this.")
             config_overrides["allow_execution"] = True
 
+    run_interactive, run_test = _get_entrypoints()
+    if startup_msgs:
+        sys.stdout.write("\n".join(startup_msgs) + "\n")
+        sys.stdout.flush()
     if args.mode == "test":
         run_test(config_overrides=config_overrides)
     else:
@@ -0,0 +1,42 @@
+"""
+_argparser.py — shared command-line parser for the assistant entrypoints.
+
+Both `python -m voice_assistant` (`__main__.py`) and `voice_assistant/cli.py` accept
+the same flags; they are defined once here so the two entrypoints cannot drift.
+"""
+import argparse
+import functools
+
+# argparse dest -> config key; only truthy values become overrides
+_FLAG_MAP = {
+    "allow_exec": "allow_execution",
+    "allow_tts": "allow_tts",
+    "use_ollama": "use_ollama",
+    "use_ollama_decider": "use_ollama_decider",
+    "always_listen": "always_listen",
+    "debug_llm": "debug_llm",
+    "ollama_path": "ollama_path",
+    "llm_model": "llm_model",
+}
+
+
+@functools.cache
+def build_parser(prog: str = "voice_assistant", description: str = "Run the offline assistant") -> argparse.ArgumentParser:
+    """Return the (cached) argument parser shared by the CLI and module entrypoints."""
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument("mode", nargs="?", choices=["run", "test"], default="run", help="run or test")
+    parser.add_argument("--allow-exec", dest="allow_exec", action="store_true", help="Allow executing system commands")
+    parser.add_argument("--allow-tts", dest="allow_tts", action="store_true", help="Enable TTS output (pyttsx3 required)")
+    parser.add_argument("--use-ollama", dest="use_ollama", action="store_true", help="Use local Ollama LLM for intent parsing")
+    parser.add_argument("--use-ollama-decider", dest="use_ollama_decider", action="store_true", help="Let the LLM decide actions (outputs JSON 'action' objects)")
+    parser.add_argument("--ollama-path", dest="ollama_path", type=str, help="Full path to ollama executable (overrides PATH)")
+    parser.add_argument("--llm-model", dest="llm_model", type=str, help="LLM model name to request from Ollama (default: llm_model from config.yaml, else phi3)")
+    parser.add_argument("--always-listen", dest="always_listen", action="store_true", help="Disable wake word and process all input immediately")
+    parser.add_argument("--debug-llm", dest="debug_llm", action="store_true", help="Log raw LLM output to assist tuning")
+    return parser
+
+
+def overrides_from_args(args: argparse.Namespace) -> dict:
+    """Translate parsed flags into a `config_overrides` dict (unset flags are omitted)."""
+    d = vars(args)
+    return {dst: d[src] for src, dst in _FLAG_MAP.items() if d.get(src)}
@@ -17,8 +17,14 @@ def ensure_parent_on_path():
     """Ensure the project root (parent of this file's parent) is on sys.path.
 
     This allows running `python voice_assistant/cli.py` from inside the `voice_assistant`
-    folder without ImportError for package imports.
+    folder without ImportError for package imports. When the package is already
+    importable (installed, or run from the project root) no path resolution is done.
     """
+    try:
+        import voice_assistant  # noqa: F401
+        return
+    except ImportError:
+        pass
     here = Path(__file__).resolve()
     project_root = here.parent.parent
     if str(project_root) not in sys.path:
@@ -26,56 +32,36 @@ def ensure_parent_on_path():
 
 
 def main(argv=None):
-    import argparse
-
     argv = argv if argv is not None else sys.argv[1:]
     ensure_parent_on_path()
-    try:
-        # import lazily after path fix
-        from voice_assistant.main import run_interactive, run_test
-    except Exception as e:
-        print("Failed to import voice_assistant.main:", e)
-        sys.exit(1)
-
-    parser = argparse.ArgumentParser(prog="voice_assistant", description="Run the offline assistant")
-    parser.add_argument("mode", nargs="?", choices=["run", "test"], default="run", help="run or test")
-    parser.add_argument("--allow-exec", dest="allow_exec", action="store_true", help="Allow executing system commands")
-    parser.add_argument("--allow-tts", dest="allow_tts", action="store_true", help="Enable TTS output (pyttsx3 required)")
-    parser.add_argument("--use-ollama", dest="use_ollama", action="store_true", help="Use local Ollama LLM for intent parsing")
-    parser.add_argument("--use-ollama-decider", dest="use_ollama_decider", action="store_true", help="Let the LLM decide actions (outputs JSON 'action' objects)")
-    parser.add_argument("--ollama-path", dest="ollama_path", type=str, help="Full path to ollama executable (overrides PATH)")
-    parser.add_argument("--llm-model", dest="llm_model", type=str, default="phi3", help="LLM model name to request from Ollama")
-    parser.add_argument("--debug-llm", dest="debug_llm", action="store_true", help="Log raw LLM output to assist tuning")
-    parser.add_argument("--always-listen", dest="always_listen", action="store_true", help="Disable wake word and process all input immediately")
+    from voice_assistant._argparser import build_parser, overrides_from_args
 
+    # parse first so --help and usage errors exit before the assistant modules load
+    parser = build_parser()
     args = parser.parse_args(argv)
 
     # Build config overrides to pass into run_interactive/run_test
-    config_overrides = {}
-    if args.allow_exec:
-        config_overrides["allow_execution"] = True
-    if args.allow_tts:
-        config_overrides["allow_tts"] = True
-    if args.use_ollama:
-        config_overrides["use_ollama"] = True
-    if args.use_ollama_decider:
-        config_overrides["use_ollama_decider"] = True
-    if args.always_listen:
-        config_overrides["always_listen"] = True
-    if args.ollama_path:
-        config_overrides["ollama_path"] = args.ollama_path
-    if args.llm_model:
-        config_overrides["llm_model"] = args.llm_model
-    if args.debug_llm:
-        config_overrides["debug_llm"] = True
+    config_overrides = overrides_from_args(args)
+    # notices are written in one go just before handing off to the runtime
+    startup_msgs = []
 
     # If the user asked for the Ollama decider, implicitly enable execution so
     # the decider's chosen action will be performed rather than only dry-run.
     # The user can still explicitly disable execution by editing config.yaml.
     if config_overrides.get("use_ollama_decider") and not config_overrides.get("allow_execution"):
-        print("Ollama decider requested — enabling execution by default. Use --allow-exec to control this behavior.")
+        startup_msgs.append("Ollama decider requested — enabling execution by default. Use --allow-exec to control this behavior.")
         config_overrides["allow_execution"] = True
 
+    try:
+        # import lazily after path fix and argument parsing
+        from voice_assistant.main import run_interactive, run_test
+    except Exception as e:
+        print("Failed to import voice_assistant.main:", e)
+        sys.exit(1)
+
+    if startup_msgs:
+        sys.stdout.write("\n".join(startup_msgs) + "\n")
+        sys.stdout.flush()
     if args.mode == "test":
         run_test(config_overrides=config_overrides)
     else:
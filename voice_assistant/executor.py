@@ -5,162 +5,218 @@ By default this skeleton will NOT run system commands. Set `allow_execution: tru
 `config.yaml` to allow. To enable voice responses, set `allow_tts: true` in the config
 and install `pyttsx3`.
 """
-import subprocess
+import sys
 import time
-import webbrowser
-from . import tts
 
+# interned intent/action names so lookups of parser output hit the identity fast path
+_OPEN_URL = sys.intern("open_url")
+_OPEN_APP = sys.intern("open_app")
+_TELL_TIME = sys.intern("tell_time")
 
-def _maybe_speak(result: dict, config: dict):
-    """If TTS is allowed, craft a short message from result and speak it."""
-    if not config.get("allow_tts", False):
+# shared results for the common validation failures; callers must not mutate these
+_ERR_NO_INTENT = {"ok": False, "error": "no_intent"}
+_ERR_NO_URL = {"ok": False, "error": "no_url"}
+_ERR_NO_APP = {"ok": False, "error": "no_app_specified"}
+
+_TIME_FMT = "%Y-%m-%d %H:%M:%S"
+_strftime = time.strftime
+
+_tts = None
+_browser = None
+
+
+def _maybe_speak(result: dict, tts_enabled: bool):
+    """If TTS is enabled, craft a short message from result and speak it."""
+    if not tts_enabled:
         return
-    # prefer explicit action
+    # import the TTS stack (pyttsx3) only when a spoken response is requested
+    global _tts
+    if _tts is None:
+        from . import tts as _tts_mod
+        _tts = _tts_mod
+    tts = _tts
+    # block until spoken: the listen loop calls stt.listen() again as soon as
+    # execute() returns, and the open mic would otherwise record the reply itself
+    # and re-run it as a new command
     if result.get("ok") and "action" in result:
-        tts.speak(result.get("action"))
+        tts.speak(result.get("action"), blocking=True)
     elif result.get("ok") and "time" in result:
-        tts.speak(f"The time is {result.get('time')}")
+        tts.speak(f"The time is {result.get('time')}", blocking=True)
     elif not result.get("ok"):
-        tts.speak(f"Error: {result.get('error')}")
+        tts.speak(f"Error: {result.get('error')}", blocking=True)
 
 
-def execute(intent, entities, config):
-    allow = bool(config.get("allow_execution", False))
+def _get_browser():
+    """Return the default `webbrowser` controller, discovering it on first use only."""
+    global _browser
+    if _browser is None:
+        import webbrowser
+        _browser = webbrowser.get()
+    return _browser
+
+
+def _browser_open(url, new=2) -> bool:
+    """Open `url` with the cached controller; fall back to webbrowser.open() on failure.
+
+    webbrowser.open() walks every registered browser until one works, which the
+    single cached controller does not; it is also where a machine without a usable
+    browser reports False instead of raising.
+    """
+    try:
+        if _get_browser().open(url, new=new):
+            return True
+    except Exception:
+        pass
+    import webbrowser
+    return webbrowser.open(url, new=new)
+
+
+def _open_with_env_browser(url) -> bool:
+    """Open `url` with the command in $BROWSER, if set. Returns False when unset or failing.
+
+    Skips webbrowser's browser discovery for users who pin $BROWSER. Like webbrowser's
+    GenericBrowser, the first os.pathsep-separated entry is used whole as the
+    executable (paths may contain spaces or backslashes) with the URL as its argument.
+    """
+    import os
+    browser = os.environ.get("BROWSER")
+    if not browser:
+        return False
+    cmd = browser.split(os.pathsep)[0]
+    if not cmd:
+        return False
+    import subprocess
+    try:
+        subprocess.Popen([cmd, url], close_fds=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        # not runnable: let the caller fall back to the default browser
+        return False
+    return True
+
+
+def _open_protocol(uri):
+    """Open a protocol URI (e.g. ms-windows-store://) with its registered handler."""
+    if sys.platform == "win32":
+        import os
+        # ShellExecute dispatches the URI directly, no browser lookup needed
+        os.startfile(uri)
+    else:
+        _browser_open(uri, new=0)
+
+
+def _start_app(name):
+    """Start an application by name without going through a shell."""
+    import os
+    if sys.platform == "win32":
+        # ShellExecute resolves registered apps (App Paths) like the `start` built-in
+        os.startfile(name)
+    else:
+        import subprocess
+        # fire-and-forget: return as soon as the process exists, don't wait for it
+        subprocess.Popen([name], close_fds=True)
+
+
+def _normalize_app(app):
+    """Return `app` as a canonical (kind, value) pair.
+
+    Parser mappings are dicts like {"type": "protocol"|"app", "value": ...}; the LLM
+    decider may instead give a plain app name string.
+    """
+    if isinstance(app, dict):
+        kind = app.get("type")
+        if kind in _APP_LAUNCHERS:
+            return kind, app.get("value")
+        return "unknown", app
+    if isinstance(app, str):
+        return "app", app
+    return "unknown", app
+
+
+def _launch_app(app):
+    """Launch `app` (a parser mapping dict or a plain name) and return a result dict."""
+    kind, value = _normalize_app(app)
+    launcher = _APP_LAUNCHERS.get(kind)
+    if launcher is None:
+        return {"ok": False, "error": "unknown_app_mapping", "mapping": app}
+    # app names are passed as data, never as shell text
+    launch, verb = launcher
+    launch(value)
+    return {"ok": True, "action": f"{verb} {value}"}
+
+
+# app kind -> (launch function, verb used in the result message)
+_APP_LAUNCHERS = {
+    "protocol": (_open_protocol, "opened protocol"),
+    "app": (_start_app, "launched"),
+}
+
+
+def _handle_open_url(args: dict, config: dict, allow: bool) -> dict:
+    url = args.get("url")
+    if not url:
+        return _ERR_NO_URL
+    if not allow:
+        return {"ok": True, "action": f"(dry-run) would open {url}"}
+    try:
+        if not _open_with_env_browser(url):
+            _browser_open(url, new=2)
+        return {"ok": True, "action": f"opened {url}"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def _handle_open_app(args: dict, config: dict, allow: bool) -> dict:
+    app = args.get("app")
+    if not app:
+        return _ERR_NO_APP
+    if not allow:
+        return {"ok": True, "action": f"(dry-run) would launch {app}"}
+    try:
+        return _launch_app(app)
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def _handle_tell_time(args: dict, config: dict, allow: bool) -> dict:
+    return {"ok": True, "time": _strftime(_TIME_FMT)}
+
+
+# intent name -> handler(entities, config, allow)
+_INTENT_HANDLERS = {
+    _OPEN_URL: _handle_open_url,
+    _OPEN_APP: _handle_open_app,
+    _TELL_TIME: _handle_tell_time,
+}
+
+
+def _compute(intent, entities, config, allow) -> dict:
+    """Resolve and run the handler for `intent`; returns the result without speaking it."""
     if intent is None:
-        res = {"ok": False, "error": "no_intent"}
-        _maybe_speak(res, config)
-        return res
+        return _ERR_NO_INTENT
 
-    # handle a few intents
-    # If the NLP returned an explicit 'action' dict (LLM-decider), honor it first
+    # If the NLP returned an explicit 'action' dict (LLM-decider), translate it into
+    # intent/entities form; its fields (url, app) already match the entity names.
     action = None
     if isinstance(entities, dict) and "action" in entities:
         action = entities.get("action")
     if action:
-        a_type = action.get("type")
-        if a_type == "open_url":
-            url = action.get("url")
-            if not url:
-                res = {"ok": False, "error": "no_url"}
-                _maybe_speak(res, config)
-                return res
-            if allow:
-                try:
-                    # Use webbrowser.open which is more reliable cross-platform
-                    webbrowser.open(url, new=2)
-                    res = {"ok": True, "action": f"opened {url}"}
-                except Exception as e:
-                    res = {"ok": False, "error": str(e)}
-                _maybe_speak(res, config)
-                return res
-            else:
-                res = {"ok": True, "action": f"(dry-run) would open {url}"}
-                _maybe_speak(res, config)
-                return res
-
-        if a_type == "open_app":
-            app = action.get("app")
-            if not app:
-                res = {"ok": False, "error": "no_app_specified"}
-                _maybe_speak(res, config)
-                return res
-            if allow:
-                try:
-                    # If the app mapping is a dict (from the parser), handle protocol/app
-                    if isinstance(app, dict):
-                        a_type2 = app.get("type")
-                        a_val = app.get("value")
-                        if a_type2 == "protocol":
-                            # open protocol URI (e.g., ms-windows-store://)
-                            webbrowser.open(a_val, new=0)
-                            res = {"ok": True, "action": f"opened protocol {a_val}"}
-                        elif a_type2 == "app":
-                            subprocess.run(f'start "" "{a_val}"', shell=True, check=False)
-                            res = {"ok": True, "action": f"launched {a_val}"}
-                        else:
-                            res = {"ok": False, "error": "unknown_app_mapping", "mapping": app}
-                    else:
-                        # On Windows, 'start' works via shell; pass a string
-                        subprocess.run(f'start "" "{app}"', shell=True, check=False)
-                        res = {"ok": True, "action": f"launched {app}"}
-                except Exception as e:
-                    res = {"ok": False, "error": str(e)}
-                _maybe_speak(res, config)
-                return res
-            else:
-                res = {"ok": True, "action": f"(dry-run) would launch {app}"}
-                _maybe_speak(res, config)
-                return res
-
-        if a_type == "tell_time":
-            t = time.strftime("%Y-%m-%d %H:%M:%S")
-            res = {"ok": True, "time": t}
-            _maybe_speak(res, config)
-            return res
+        intent, entities = action.get("type"), action
+    # strings decoded from LLM JSON are not interned
+    if isinstance(intent, str):
+        intent = sys.intern(intent)
 
+    handler = _INTENT_HANDLERS.get(intent)
+    if handler:
+        return handler(entities, config, allow)
+    if action:
         # unknown action type from LLM
-        res = {"ok": False, "error": "unknown_action_type", "action": action}
-        _maybe_speak(res, config)
-        return res
-
-    if intent == "open_url":
-        url = entities.get("url")
-        if not url:
-            res = {"ok": False, "error": "no_url"}
-            _maybe_speak(res, config)
-            return res
-        if allow:
-            # Windows: use start
-            try:
-                webbrowser.open(url, new=2)
-                res = {"ok": True, "action": f"opened {url}"}
-            except Exception as e:
-                res = {"ok": False, "error": str(e)}
-            _maybe_speak(res, config)
-            return res
-        else:
-            res = {"ok": True, "action": f"(dry-run) would open {url}"}
-            _maybe_speak(res, config)
-            return res
-
-    if intent == "open_app":
-        app = entities.get("app")
-        if not app:
-            res = {"ok": False, "error": "no_app_specified"}
-            _maybe_speak(res, config)
-            return res
-        if allow:
-            try:
-                if isinstance(app, dict):
-                    a_type2 = app.get("type")
-                    a_val = app.get("value")
-                    if a_type2 == "protocol":
-                        webbrowser.open(a_val, new=0)
-                        res = {"ok": True, "action": f"opened protocol {a_val}"}
-                    elif a_type2 == "app":
-                        subprocess.run(f'start "" "{a_val}"', shell=True, check=False)
-                        res = {"ok": True, "action": f"launched {a_val}"}
-                    else:
-                        res = {"ok": False, "error": "unknown_app_mapping", "mapping": app}
-                else:
-                    subprocess.run(f'start "" "{app}"', shell=True, check=False)
-                    res = {"ok": True, "action": f"launched {app}"}
-            except Exception as e:
-                res = {"ok": False, "error": str(e)}
-            _maybe_speak(res, config)
-            return res
-        else:
-            res = {"ok": True, "action": f"(dry-run) would launch {app}"}
-            _maybe_speak(res, config)
-            return res
-
-    if intent == "tell_time":
-        t = time.strftime("%Y-%m-%d %H:%M:%S")
-        res = {"ok": True, "time": t}
-        _maybe_speak(res, config)
-        return res
-
-    # fallback
-    res = {"ok": False, "error": "unknown_intent", "intent": intent}
-    _maybe_speak(res, config)
+        return {"ok": False, "error": "unknown_action_type", "action": action}
+    return {"ok": False, "error": "unknown_intent", "intent": intent}
+
+
+def execute(intent, entities, config):
+    allow = bool(config.get("allow_execution", False))
+    tts_enabled = bool(config.get("allow_tts", False))
+    res = _compute(intent, entities, config, allow)
+    _maybe_speak(res, tts_enabled)
     return res
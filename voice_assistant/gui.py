@@ -13,7 +13,8 @@ Or double-click `run_voice_assistant_ui.bat` in the project root.
 """
 import tkinter as tk
 from tkinter import ttk
-from threading import Thread
+from threading import Event, Thread
+import collections
 import queue
 import time
 import sys
@@ -23,8 +24,57 @@ from pathlib import Path
 from . import stt, nlp_model, executor
 from . import main as core_main
 
+# STT availability probed once at import; refreshed by AssistantUI every
+# _STT_REFRESH_MS and whenever an option is toggled
+_STT_OK = stt.available()
+_STT_REFRESH_MS = 5000
+
+
+class _DaemonPool:
+    """Fixed set of daemon worker threads fed from a queue.
+
+    concurrent.futures joins its (non-daemon) workers at interpreter exit, so closing
+    the window during a slow Ollama call would hang until it returned; these threads
+    just die with the process, like the per-command threads they replaced.
+    """
+
+    def __init__(self, workers: int, name: str):
+        self._q = queue.SimpleQueue()
+        self._closed = False
+        self._threads = [Thread(target=self._run, name=f"{name}_{i}", daemon=True) for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, fn, *args):
+        if not self._closed:
+            self._q.put((fn, args))
+
+    def shutdown(self):
+        """Drop queued work and let idle workers exit; running calls are abandoned."""
+        self._closed = True
+        for _ in self._threads:
+            self._q.put(None)
+
+    def _run(self):
+        while True:
+            item = self._q.get()
+            if item is None or self._closed:
+                return
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception:
+                pass
+
 
 class AssistantUI:
+    # ring growth (px beyond the 30 px base radius) before a ring restarts from the centre
+    _RING_MAX = 48
+    # animation frame period in ms
+    _FRAME_MS = 90
+    # option summary labels, indexed by the option's bool value
+    _ONOFF = ("Off", "On")
+
     def __init__(self, root):
         self.root = root
         root.title("Offline Voice Assistant")
@@ -38,12 +88,37 @@ class AssistantUI:
             pass
 
         self.config = core_main.load_config()
+        # config handed to workers: the UI option keys are refreshed in place by
+        # _current_cfg(), consumers get a read-only view of it
+        self._live_cfg = dict(self.config)
+        self._live_cfg["always_listen"] = True
+        self._live_cfg_view = core_main._freeze_config(self._live_cfg)
         self.memory = core_main.load_memory()
 
-        self.queue = queue.Queue()
+        # deque append/popleft are atomic under the GIL; only the Tk thread consumes
+        self.queue = collections.deque()
+        # listen-loop gates: set while real STT is usable / to cut an idle wait short
+        self._stt_available_event = Event()
+        if _STT_OK:
+            self._stt_available_event.set()
+        self._wake_event = Event()
+        # bounded pool for process_text work; the listen loop keeps its own thread
+        self._pool = _DaemonPool(2, "va-worker")
         self.listening = False
         self.anim_phase = 0
         self.anim_id = None
+        self.ring_items = []
+        self._status_handlers = {
+            "loading": self._on_loading,
+            "listening": self._on_listening,
+            "simulated": self._on_simulated,
+            "idle": self._on_idle,
+        }
+        # inner circle pulse colors, one per animation phase (grey -> red)
+        self._anim_colors = [
+            "#{:02x}{:02x}{:02x}".format(int(68 + (180 - 68) * p), int(68 * (1 - p)), int(68 * (1 - p)))
+            for p in (i / 30.0 for i in range(30))
+        ]
 
         # Top layout area: left = large mic canvas, right = status and options
         top = ttk.Frame(root)
@@ -88,17 +163,19 @@ class AssistantUI:
         except Exception:
             pass
 
-        # reflect changes immediately when options are toggled
+        # reflect option toggles on the next idle tick; several writes in one
+        # event-loop pass coalesce into a single update
+        self._opt_dirty = False
         try:
-            self.allow_exec_var.trace_add("write", lambda *a: self._on_option_change())
-            self.use_ollama_var.trace_add("write", lambda *a: self._on_option_change())
-            self.ollama_decider_var.trace_add("write", lambda *a: self._on_option_change())
+            self.allow_exec_var.trace_add("write", self._schedule_opt_update)
+            self.use_ollama_var.trace_add("write", self._schedule_opt_update)
+            self.ollama_decider_var.trace_add("write", self._schedule_opt_update)
         except Exception:
-            self.allow_exec_var.trace("w", lambda *a: self._on_option_change())
-            self.use_ollama_var.trace("w", lambda *a: self._on_option_change())
-            self.ollama_decider_var.trace("w", lambda *a: self._on_option_change())
+            self.allow_exec_var.trace("w", self._schedule_opt_update)
+            self.use_ollama_var.trace("w", self._schedule_opt_update)
+            self.ollama_decider_var.trace("w", self._schedule_opt_update)
 
-        self._on_option_change()
+        self._schedule_opt_update()
 
         # compact option summary label (keeps previous behavior of showing Exec/Ollama/Decider summary)
         self.option_label = tk.Label(right, text="", fg="#999", bg="#0f0f10", font=("Segoe UI", 9))
@@ -117,11 +194,28 @@ class AssistantUI:
         except Exception:
             pass
 
-        # Poll queue for results and start auto-listen loop
-        self.root.after(200, self._poll_queue)
+        # Workers wake the UI thread via a virtual event; a slow watchdog drain
+        # covers any event lost while the window was busy. Then start auto-listen.
+        self.root.bind("<<QueueItem>>", self._drain_queue)
+        self.root.after(500, self._queue_watchdog)
         self._running = True
+        root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(_STT_REFRESH_MS, self._stt_refresh_timer)
         self._start_auto_listen()
 
+    def _on_close(self):
+        self._running = False
+        self._pool.shutdown()
+        self.root.destroy()
+
+    def _post(self, item):
+        """Queue `item` for the UI thread and wake the Tk event loop to drain it."""
+        self.queue.append(item)
+        try:
+            self.root.event_generate("<<QueueItem>>", when="tail")
+        except Exception:
+            pass
+
     def _set_status(self, text):
         self.status_label.config(text=text)
 
@@ -158,33 +252,68 @@ class AssistantUI:
         t = Thread(target=self._auto_listen_loop, daemon=True)
         t.start()
 
+    def _schedule_opt_update(self, *args):
+        if not self._opt_dirty:
+            self._opt_dirty = True
+            self.root.after_idle(self._do_opt_update)
+
+    def _do_opt_update(self):
+        self._opt_dirty = False
+        self._on_option_change()
+
     def _on_option_change(self):
         # update compact option summary next to status
         try:
-            parts = []
-            parts.append("Exec:On" if self.allow_exec_var.get() else "Exec:Off")
-            parts.append("Ollama:On" if self.use_ollama_var.get() else "Ollama:Off")
-            parts.append("Decider:On" if self.ollama_decider_var.get() else "Decider:Off")
-            self.option_label.config(text=" | ".join(parts))
+            onoff = self._ONOFF
+            self.option_label.config(text="Exec:{} | Ollama:{} | Decider:{}".format(
+                onoff[bool(self.allow_exec_var.get())],
+                onoff[bool(self.use_ollama_var.get())],
+                onoff[bool(self.ollama_decider_var.get())],
+            ))
         except Exception:
             pass
+        # re-probe STT and wake the listen loop so new options apply immediately
+        self._probe_stt()
+        self._wake_event.set()
+
+    def _probe_stt(self):
+        """Re-check STT availability and update the cached flag and listen-loop gate."""
+        global _STT_OK
+        try:
+            stt.invalidate_availability()
+            _STT_OK = stt.available()
+        except Exception:
+            _STT_OK = False
+        if _STT_OK:
+            self._stt_available_event.set()
+        else:
+            self._stt_available_event.clear()
+
+    def _stt_refresh_timer(self):
+        # microphones/models can appear while the UI is open (hot-plug, download)
+        self._probe_stt()
+        self.root.after(_STT_REFRESH_MS, self._stt_refresh_timer)
+
+    def _current_cfg(self):
+        """Refresh the UI option values in the live config and return its read-only view."""
+        cfg = self._live_cfg
+        cfg["allow_execution"] = self.allow_exec_var.get()
+        cfg["use_ollama"] = self.use_ollama_var.get()
+        cfg["use_ollama_decider"] = self.ollama_decider_var.get()
+        return self._live_cfg_view
 
     def _auto_listen_loop(self):
         # Continuous listening loop similar to CLI run_interactive
         while getattr(self, "_running", False):
             try:
-                cfg = self.config.copy()
-                cfg["allow_execution"] = self.allow_exec_var.get()
-                cfg["use_ollama"] = self.use_ollama_var.get()
-                cfg["use_ollama_decider"] = self.ollama_decider_var.get()
-                cfg["always_listen"] = True
+                cfg = self._current_cfg()
 
                 # notify UI that we're starting STT and pass a status callback
                 recognized = None
                 def _stt_status_cb(s):
                     # s can be 'loading', 'listening', or 'simulated'
                     try:
-                        self.queue.put(("stt_status", s, None))
+                        self._post(("stt_status", sys.intern(s), None))
                     except Exception:
                         pass
                 # In GUI mode we avoid using the stdin fallback of stt.listen()
@@ -192,31 +321,33 @@ class AssistantUI:
                 # gives the impression of "not listening". Check availability
                 # and prompt the user to type when real STT isn't present.
                 try:
-                    if not stt.available():
+                    if not _STT_OK:
                         # inform UI that STT is simulated/unavailable and focus entry
                         try:
-                            self.queue.put(("stt_status", "simulated", None))
-                            self.queue.put(("focus_entry", None, None))
+                            self._post(("stt_status", "simulated", None))
+                            self._post(("focus_entry", None, None))
                         except Exception:
                             pass
-                        time.sleep(0.7)
+                        # no mic: sleep until an option toggle re-probes STT (or 5 s)
+                        self._stt_available_event.clear()
+                        self._stt_available_event.wait(timeout=5.0)
                         continue
                     recognized = stt.listen(status_cb=_stt_status_cb)
                 except Exception:
                     recognized = None
 
                 if not recognized:
-                    # idle briefly
-                    time.sleep(0.4)
-                    self.queue.put(("status", "idle", None))
+                    # idle briefly; typed input or an option change ends the wait early
+                    self._wake_event.wait(timeout=0.2)
+                    self._wake_event.clear()
+                    self._post(("status", "idle", None))
                     continue
 
                 # process recognized text in background so the listen loop can continue
-                Thread(target=self._process_and_queue, args=(recognized, cfg), daemon=True).start()
-                # small backoff to avoid tight loop
-                time.sleep(0.05)
+                self._pool.submit(self._process_and_queue, recognized, cfg)
             except Exception:
-                time.sleep(0.5)
+                self._wake_event.wait(timeout=0.5)
+                self._wake_event.clear()
 
     def _listen_worker(self, cfg):
         # call the existing stt.listen() — it may return None or an empty string
@@ -228,42 +359,68 @@ class AssistantUI:
         # If STT not available or empty, prompt for text input in the UI thread
         if not recognized:
             # ask user to type text
-            self.queue.put(("prompt_text", None, cfg))
+            self._post(("prompt_text", None, cfg))
             return
 
         # process text using main.process_text
         res = core_main.process_text(recognized, cfg, self.memory)
-        self.queue.put(("result", recognized, res))
+        self._post(("result", recognized, res))
 
     def _process_and_queue(self, recognized, cfg):
         """Background worker: run main.process_text and push the result to the UI queue."""
         try:
             res = core_main.process_text(recognized, cfg, self.memory)
             try:
-                self.queue.put(("result", recognized, res))
+                self._post(("result", recognized, res))
             except Exception:
                 pass
         except Exception as e:
             try:
-                self.queue.put(("result", recognized, {"ok": False, "error": str(e)}))
+                self._post(("result", recognized, {"ok": False, "error": str(e)}))
             except Exception:
                 pass
 
-    def _poll_queue(self):
+    # Status handlers: map a status string to its UI message and animation state
+    def _on_loading(self):
+        self._set_status("Loading model...")
+        self.listening = False
+        self._stop_anim()
+
+    def _on_listening(self):
+        self._set_status("Listening...")
+        self.listening = True
+        self._start_anim()
+
+    def _on_simulated(self):
+        self._set_status("Simulated input - type or speak")
+        self.listening = False
+        self._stop_anim()
+
+    def _on_idle(self):
+        self._set_status("Idle")
+        self.listening = False
+        self._stop_anim()
+
+    def _queue_watchdog(self):
+        # reschedule even if a handler raised (e.g. TclError), or the fallback dies
         try:
-            while True:
-                item = self.queue.get_nowait()
+            self._drain_queue()
+        finally:
+            self.root.after(500, self._queue_watchdog)
+
+    def _drain_queue(self, _evt=None):
+        try:
+            while self.queue:
+                item = self.queue.popleft()
                 kind, text, payload = item
-                if kind == "status":
-                    if text == "listening":
-                        self._set_status("Listening...")
-                        self.listening = True
-                        self._start_anim()
-                    else:
-                        self._set_status("Idle")
-                        self.listening = False
-                        self._stop_anim()
-                    self.queue.task_done()
+                if kind == "status" or kind == "stt_status":
+                    # 'status' items are 'listening' or 'idle'; STT reports
+                    # 'loading', 'listening' or 'simulated'
+                    handler = self._status_handlers.get(text)
+                    if handler is None and kind == "status":
+                        handler = self._on_idle
+                    if handler:
+                        handler()
                     continue
 
                 if kind == "prompt_text":
@@ -279,23 +436,6 @@ class AssistantUI:
                         self._set_status("No mic — type command below")
                     except Exception:
                         pass
-                elif kind == "stt_status":
-                    # Map STT status to friendly UI messages and animation
-                    st = text
-                    if st == "loading":
-                        self._set_status("Loading model...")
-                        self.listening = False
-                        self._stop_anim()
-                    elif st == "listening":
-                        self._set_status("Listening...")
-                        self.listening = True
-                        self._start_anim()
-                    elif st == "simulated":
-                        self._set_status("Simulated input - type or speak")
-                        self.listening = False
-                        self._stop_anim()
-                    self.queue.task_done()
-                    continue
                 elif kind == "result":
                     recognized, res = text, payload
                     self._stop_anim()
@@ -303,11 +443,9 @@ class AssistantUI:
                     self._set_status("Idle")
                     self._append_recognized(recognized)
                     self._append_result(str(res))
-                self.queue.task_done()
-        except queue.Empty:
+        except IndexError:
+            # queue emptied between the truthiness check and popleft()
             pass
-        finally:
-            self.root.after(200, self._poll_queue)
 
     def _show_text_input(self, cfg):
         win = tk.Toplevel(self.root)
@@ -326,15 +464,14 @@ class AssistantUI:
                 return
             self._set_status("Processing...")
             # process in background
-            thread = Thread(target=self._process_text_worker, args=(text, cfg), daemon=True)
-            thread.start()
+            self._pool.submit(self._process_text_worker, text, cfg)
 
         entry.bind("<Return>", on_enter)
         ttk.Button(win, text="Cancel", command=lambda: (win.destroy(), self._set_status("Idle"))).pack(pady=(6, 4))
 
     def _process_text_worker(self, text, cfg):
         res = core_main.process_text(text, cfg, self.memory)
-        self.queue.put(("result", text, res))
+        self._post(("result", text, res))
 
     def _on_manual_enter(self, evt=None):
         # read from the recognized single-line entry (user can type here)
@@ -344,54 +481,65 @@ class AssistantUI:
             text = ""
         if not text:
             return
-        cfg = self.config.copy()
-        cfg["allow_execution"] = self.allow_exec_var.get()
-        cfg["use_ollama"] = self.use_ollama_var.get()
-        cfg["use_ollama_decider"] = self.ollama_decider_var.get()
-        cfg["always_listen"] = True
+        cfg = self._current_cfg()
         try:
             self.rec_entry.delete(0, 'end')
         except Exception:
             pass
         self._set_status("Processing...")
-        Thread(target=self._process_text_worker, args=(text, cfg), daemon=True).start()
+        self._pool.submit(self._process_text_worker, text, cfg)
+        self._wake_event.set()
 
     def _start_anim(self):
-        # improved pulsing rings animation
+        # a cached model skips "loading", so "listening" can arrive while a chain is
+        # still scheduled; starting a second one would run it at double rate
+        if self.anim_id is not None:
+            return
+        # improved pulsing rings animation; ring items are created once and reused
         self.anim_phase = 0
         self.rings = [0, 8, 16]
-        self.ring_items = []
+        # frames are derived from a monotonic clock so a busy UI thread skips ahead
+        # instead of drifting
+        self._anim_t0 = time.monotonic()
+        self._anim_last_frame = -1
+        # canvas is a fixed 140x140; per-frame Tcl calls bypass tkinter's option translation
+        self._anim_cx = self._anim_cy = 70
+        self._tk_call = self.canvas.tk.call
+        self._canvas_cmd = self.canvas._w
+        if not self.ring_items:
+            self.ring_items = [
+                self.canvas.create_oval(0, 0, 0, 0, outline="#c83c3c", width=w, state="hidden")
+                for w in (6, 4, 2)
+            ]
         self._animate()
 
     def _animate(self):
         if not self.listening:
+            # the chain ends here; let the next _start_anim() begin a new one
+            self.anim_id = None
             return
-        w = 140
-        h = 140
-        cx = w // 2
-        cy = h // 2
-        # remove previous rings
-        for it in getattr(self, 'ring_items', []):
-            try:
-                self.canvas.delete(it)
-            except Exception:
-                pass
-        self.ring_items = []
-        for i in range(len(self.rings)):
-            self.rings[i] += 2
+        cx = self._anim_cx
+        cy = self._anim_cy
+        call = self._tk_call
+        cmd = self._canvas_cmd
+        elapsed_ms = (time.monotonic() - self._anim_t0) * 1000
+        frame = int(elapsed_ms // self._FRAME_MS)
+        steps = max(1, frame - self._anim_last_frame)
+        self._anim_last_frame = frame
+        for i, it in enumerate(self.ring_items):
+            # grow 2 px per frame, wrapping to 0 once past _RING_MAX
+            self.rings[i] = (self.rings[i] + 2 * steps) % (self._RING_MAX + 2)
             r = 30 + self.rings[i]
-            clr = f"#{200:02x}{60:02x}{60:02x}"
-            it = self.canvas.create_oval(cx - r, cy - r, cx + r, cy + r, outline=clr, width=max(1, 6 - i * 2))
-            self.ring_items.append(it)
+            call(cmd, "coords", it, cx - r, cy - r, cx + r, cy + r)
+            call(cmd, "itemconfigure", it, "-state", "normal")
         # subtle inner circle color change
-        phase = (self.anim_phase % 30) / 30.0
-        inner_r = int(68 + (180 - 68) * phase)
-        inner_g = int(68 * (1 - phase))
-        inner_b = int(68 * (1 - phase))
-        color = f"#{inner_r:02x}{inner_g:02x}{inner_b:02x}"
-        self.canvas.itemconfigure(self.base_circle, fill=color)
-        self.anim_phase += 1
-        self.anim_id = self.root.after(90, self._animate)
+        color = self._anim_colors[self.anim_phase % len(self._anim_colors)]
+        call(cmd, "itemconfigure", self.base_circle, "-fill", color)
+        self.anim_phase += steps
+        self.canvas.update_idletasks()
+        # sleep until the next frame boundary rather than a fixed 90 ms after this one
+        delay = max(1, int(self._FRAME_MS - elapsed_ms % self._FRAME_MS))
+        self.anim_id = self.root.after(delay, self._animate)
 
     def _stop_anim(self):
         if self.anim_id:
@@ -402,12 +550,11 @@ class AssistantUI:
             self.anim_id = None
         # restore base color
         self.canvas.itemconfigure(self.base_circle, fill="#444")
-        for it in getattr(self, 'ring_items', []):
+        for it in self.ring_items:
             try:
-                self.canvas.delete(it)
+                self.canvas.itemconfigure(it, state="hidden")
             except Exception:
                 pass
-        self.ring_items = []
 
 
 def main():
@@ -9,11 +9,49 @@ This file provides:
 
 No external dependencies required for this skeleton.
 """
+import atexit
+import copy
 import json
+import re
+import threading
 import time
 import os
+import types
 from pathlib import Path
 
+HAS_YAML = False
+
+try:
+    import yaml
+    try:
+        from yaml import CSafeLoader as _YamlBase
+    except ImportError:
+        from yaml import SafeLoader as _YamlBase
+
+    class _YamlLoader(_YamlBase):
+        """Safe loader that types scalars like the fallback parser does.
+
+        Only true/false (any case) become bools and an empty value becomes None
+        (normalized to [] later); everything else, including yes/no/on/off and
+        numbers, stays a string.
+        """
+        yaml_implicit_resolvers = {}
+
+    _YamlLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool", re.compile(r"^(?:true|false)$", re.I), list("tTfF"))
+    _YamlLoader.add_implicit_resolver("tag:yaml.org,2002:null", re.compile(r"^$"), [""])
+    HAS_YAML = True
+except Exception:
+    yaml = None
+
+HAS_ORJSON = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    orjson = None
+
 from . import stt
 from . import nlp_model
 from . import executor
@@ -22,51 +60,151 @@ ROOT = Path(__file__).resolve().parent
 CONFIG_PATH = ROOT / "config.yaml"
 MEMORY_PATH = ROOT / "memory.json"
 
+# str(path) -> (mtime_ns, parsed config); load_config() hands out deep copies so a
+# caller mutating its config (or a list in it) never changes the cached one
+_CFG_CACHE = {}
+
 
 def load_config(path=CONFIG_PATH):
-    # naive YAML-like parser for the minimal config we ship
-    config = {}
+    """Return the parsed config as a fresh dict, re-reading the file only when it changes."""
     if not path.exists():
-        return config
-    with open(path, "r", encoding="utf-8") as f:
-        lines = [l.rstrip("\n") for l in f]
+        return {}
+    mtime = path.stat().st_mtime_ns
+    cached = _CFG_CACHE.get(str(path))
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, _parse_config(path))
+        _CFG_CACHE[str(path)] = cached
+    return copy.deepcopy(cached[1])
+
+
+def _freeze_config(cfg):
+    """Return a read-only view of `cfg` for consumers that must not mutate it."""
+    return types.MappingProxyType(cfg)
+
+
+# fallback parser: one pass over the file matching top-level `key: value` lines and
+# indented `- item` list entries (comments and anything else are skipped)
+_CFG_LINE_RE = re.compile(
+    r"^(?:(?P<key>[A-Za-z_][A-Za-z0-9_]*)[ \t]*:[ \t]*(?P<val>.*?)|[ \t]+-[ \t]*(?P<item>.*?))[^\S\n]*$",
+    re.M,
+)
+
+
+def _parse_config(path):
+    text = path.read_text(encoding="utf-8")
+    if HAS_YAML:
+        try:
+            data = yaml.load(text, Loader=_YamlLoader)
+            if not isinstance(data, dict):
+                return {}
+            # an empty `key:` is an empty list, as in the fallback parser
+            return {k: [] if v is None else v for k, v in data.items()}
+        except yaml.YAMLError:
+            pass
 
+    # naive YAML-like parser for the minimal config we ship
+    config = {}
     key = None
-    for line in lines:
-        if not line.strip() or line.strip().startswith("#"):
+    for m in _CFG_LINE_RE.finditer(text):
+        item = m.group("item")
+        if item is not None:
+            if key:
+                config[key].append(item)
             continue
-        if line.startswith(" ") or line.startswith("\t"):
-            # list item or nested
-            if key and line.strip().startswith("-"):
-                config.setdefault(key, [])
-                config[key].append(line.strip()[1:].strip())
+        k, v = m.group("key"), m.group("val")
+        if v == "":
+            config[k] = []
+            key = k
+        elif v.lower() in ("true", "false"):
+            config[k] = v.lower() == "true"
+            key = None
         else:
-            if ":" in line:
-                k, v = line.split(":", 1)
-                k = k.strip()
-                v = v.strip()
-                if v == "":
-                    config[k] = []
-                    key = k
-                elif v.lower() in ("true", "false"):
-                    config[k] = v.lower() == "true"
-                    key = None
-                else:
-                    config[k] = v
-                    key = None
+            config[k] = v
+            key = None
     return config
 
 
+def _dumps_memory(mem) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(mem)
+    return json.dumps(mem, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads_memory(data: bytes):
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_memory(path=MEMORY_PATH):
     if not path.exists():
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _loads_memory(path.read_bytes())
+
+
+# Memory writes are coalesced: save_memory() only marks the memory dirty and arms a
+# background timer, which rewrites the file at most every _MEM_FLUSH_INTERVAL
+# seconds; whatever is still pending is written once at exit.
+_MEM_FLUSH_INTERVAL = 2.0
+# _MEM_LOCK guards the pending state; _MEM_WRITE_LOCK orders the file writes, so
+# the command path never waits on disk I/O
+_MEM_LOCK = threading.Lock()
+_MEM_WRITE_LOCK = threading.Lock()
+_MEM_DIRTY = False
+_MEM_PENDING = None
+_MEM_LAST_FLUSH = float("-inf")
+_MEM_TIMER = None
 
 
 def save_memory(mem, path=MEMORY_PATH):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(mem, f, indent=2)
+    """Mark `mem` to be persisted to `path` by the background flush timer."""
+    global _MEM_DIRTY, _MEM_PENDING, _MEM_TIMER
+    with _MEM_LOCK:
+        _MEM_PENDING = (mem, path)
+        _MEM_DIRTY = True
+        if _MEM_TIMER is None:
+            # flush as soon as the interval since the last write is over
+            delay = max(0.0, _MEM_LAST_FLUSH + _MEM_FLUSH_INTERVAL - time.monotonic())
+            _MEM_TIMER = threading.Timer(delay, _flush_memory_timer)
+            _MEM_TIMER.daemon = True
+            _MEM_TIMER.start()
+
+
+def _write_memory(data: bytes, path):
+    # write to a temp file then rename so a crash never leaves a truncated memory.json
+    path = Path(path)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _flush_memory_if_due(now=None, min_interval=_MEM_FLUSH_INTERVAL, force=False):
+    """Write pending memory if dirty and `min_interval` seconds passed since the last write."""
+    global _MEM_DIRTY, _MEM_LAST_FLUSH
+    with _MEM_WRITE_LOCK:
+        now = time.monotonic() if now is None else now
+        with _MEM_LOCK:
+            if not _MEM_DIRTY or (not force and now - _MEM_LAST_FLUSH < min_interval):
+                return
+            mem, path = _MEM_PENDING
+            data = _dumps_memory(mem)
+            _MEM_DIRTY = False
+            _MEM_LAST_FLUSH = now
+        _write_memory(data, path)
+
+
+def _flush_memory_timer():
+    global _MEM_TIMER
+    with _MEM_LOCK:
+        _MEM_TIMER = None
+    _flush_memory_if_due(force=True)
+
+
+def _force_flush_memory():
+    _flush_memory_if_due(force=True)
+
+
+atexit.register(_force_flush_memory)
 
 
 def process_text(text, config, memory):
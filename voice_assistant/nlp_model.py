@@ -6,40 +6,135 @@ with a local LLM via the `ollama` CLI. Enable LLM parsing by setting
 `use_ollama: true` and `llm_model: <model-name>` in `config.yaml` (default model: `phi3`).
 
 Behavior:
+- The rule-based parser is tried first; the LLM is only consulted for commands it
+  does not recognise (set `prefer_llm: true` to ask the LLM first).
 - If `use_ollama` is True and the `ollama` CLI is available, the module will call
   the model with a short prompt and expect JSON output with `intent` and `entities`.
+  Requests go to a running `ollama serve` over a kept-alive local HTTP connection;
+  if the server is not reachable the `ollama run` CLI is spawned instead, and its
+  output is read incrementally so the process is stopped once a JSON object is complete.
+- Successful LLM parses are cached per (text, model, decider mode).
 - If LLM parsing fails for any reason, the code falls back to the rule-based parser.
 """
 
+import http.client
 import json
+import os
+import selectors
 import shutil
 import subprocess
 import re
+import sys
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+# local `ollama serve` REST endpoint; one keep-alive connection shared under a lock
+_OLLAMA_HOST = "127.0.0.1"
+_OLLAMA_PORT = 11434
+_http_conn = None
+_http_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _which_ollama_cached(path: str = None) -> bool:
+    """Probe for ollama once per path; the PATH walk never changes within a process."""
+    if path:
+        return Path(path).exists()
+    return shutil.which("ollama") is not None
+
 
 def _ollama_available(ollama_path: str = None) -> bool:
     """Return True if an ollama executable is available.
 
     If `ollama_path` is provided, check that path exists; otherwise use shutil.which.
+    Results are cached; call `_ollama_available.cache_clear()` after installing ollama
+    or changing `ollama_path` at runtime.
     """
-    if ollama_path:
-        return Path(ollama_path).exists()
-    return shutil.which("ollama") is not None
+    return _which_ollama_cached(ollama_path or None)
 
 
-def _call_ollama(prompt: str, model: str = "phi3", timeout: int = 10, ollama_exec: str = None) -> str:
-    """Call `ollama run <model>` with `prompt` on stdin and return stdout as text.
+_ollama_available.cache_clear = _which_ollama_cached.cache_clear
+
+
+# _post_ollama result when the server accepted the request but did not answer in
+# time; retrying or spawning `ollama run` would only start another slow generation
+_SERVER_FAILED = object()
+
+# errors from a kept-alive connection the server has already closed
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
 
-    This is intentionally simple and robust: we capture stdout/stderr and return
-    whatever the model produced, leaving the caller to parse JSON within the output.
+
+def _post_ollama(prompt_json: bytes, model: str = "phi3", timeout: int = 10):
+    """Send a prompt to the local `ollama serve` /api/generate endpoint.
+
+    `prompt_json` is the prompt already encoded as a JSON string literal (quotes
+    included). Returns the model's response text; None if the server is not
+    reachable or answered with an error (the caller then falls back to the CLI);
+    or _SERVER_FAILED if it timed out, in which case the caller should not retry.
     """
+    global _http_conn
+    body = b"".join((b'{"model": ', json.dumps(model).encode("utf-8"), b', "stream": false, "prompt": ', prompt_json, b"}"))
+    with _http_lock:
+        # a kept-alive connection may have been closed by the server; retry once fresh
+        for _ in range(2):
+            reused = _http_conn is not None
+            if not reused:
+                _http_conn = http.client.HTTPConnection(_OLLAMA_HOST, _OLLAMA_PORT, timeout=timeout)
+            try:
+                _http_conn.request("POST", "/api/generate", body, {"Content-Type": "application/json"})
+                resp = _http_conn.getresponse()
+                data = resp.read()
+            except _STALE_CONN_ERRORS:
+                _http_conn.close()
+                _http_conn = None
+                if reused:
+                    continue
+                return None
+            except TimeoutError:
+                _http_conn.close()
+                _http_conn = None
+                return _SERVER_FAILED
+            except (OSError, http.client.HTTPException):
+                _http_conn.close()
+                _http_conn = None
+                return None
+            if resp.status != 200:
+                return None
+            try:
+                return json.loads(data).get("response", "")
+            except (ValueError, AttributeError):
+                return None
+    return None
+
+
+def _call_ollama_bytes(prompt: bytes, prompt_json: bytes, model: str = "phi3", timeout: int = 10, ollama_exec: str = None) -> str:
+    """Run an encoded prompt through `model` and return the raw output text.
+
+    `prompt` is the UTF-8 prompt (piped to `ollama run`), `prompt_json` the same
+    prompt as a JSON string literal (sent to `ollama serve`). Prefers the HTTP API;
+    if the server is up but times out, returns "" rather than trying again. Otherwise
+    calls `ollama run <model>` with the prompt on stdin. This is intentionally simple
+    and robust: we capture stdout/stderr and return whatever the model produced,
+    leaving the caller to parse JSON within the output.
+    """
+    out = _post_ollama(prompt_json, model=model, timeout=timeout)
+    if out is _SERVER_FAILED:
+        return ""
+    if out is not None:
+        return out
     try:
         cmd = [ollama_exec, "run", model] if ollama_exec else ["ollama", "run", model]
-        proc = subprocess.run(cmd, input=prompt.encode("utf-8"), capture_output=True, timeout=timeout)
-        out = proc.stdout.decode("utf-8", errors="ignore")
-        err = proc.stderr.decode("utf-8", errors="ignore")
+        if sys.platform == "win32":
+            # selectors cannot wait on pipes on Windows; buffer the whole run there
+            proc = subprocess.run(cmd, input=prompt, capture_output=True, timeout=timeout)
+            out_b, err_b = proc.stdout, proc.stderr
+        else:
+            out_b, err_b = _run_streaming(cmd, prompt, timeout)
+        out = out_b.decode("utf-8", errors="ignore")
+        err = err_b.decode("utf-8", errors="ignore")
         if err and not out:
             # sometimes model prints to stderr — include it
             out += "\n" + err
@@ -48,79 +143,244 @@ def _call_ollama(prompt: str, model: str = "phi3", timeout: int = 10, ollama_exe
         return ""
 
 
+def _run_streaming(cmd, prompt: bytes, timeout: float):
+    """Run `cmd` with `prompt` on stdin and return (stdout, stderr) bytes.
+
+    Stdout is read in 4 KB chunks; as soon as it holds a complete JSON object the
+    process is killed instead of waiting for the model to finish any trailing text.
+    Raises subprocess.TimeoutExpired if nothing usable arrives within `timeout`.
+    """
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        try:
+            proc.stdin.write(prompt)
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        out, err = bytearray(), bytearray()
+        bufs = {proc.stdout.fileno(): out, proc.stderr.fileno(): err}
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as sel:
+            # stderr is drained too, so a chatty CLI cannot block on a full pipe
+            for fd in bufs:
+                sel.register(fd, selectors.EVENT_READ)
+            while bufs:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                for key, _ in sel.select(remaining):
+                    chunk = os.read(key.fd, 4096)
+                    if not chunk:
+                        sel.unregister(key.fd)
+                        del bufs[key.fd]
+                        continue
+                    bufs[key.fd] += chunk
+                    if key.fd == proc.stdout.fileno() and _has_json(out):
+                        return bytes(out), bytes(err)
+        return bytes(out), bytes(err)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def _has_json(buf: bytearray) -> bool:
+    """Return True once `buf` contains a complete JSON object starting at its first '{'."""
+    text = buf.decode("utf-8", "ignore")
+    idx = text.find("{")
+    if idx < 0:
+        return False
+    try:
+        _DEC.raw_decode(text, idx)
+    except ValueError:
+        return False
+    return True
+
+
+def _call_ollama(prompt: str, model: str = "phi3", timeout: int = 10, ollama_exec: str = None) -> str:
+    """Call the model with a text `prompt` and return its raw output text."""
+    return _call_ollama_bytes(prompt.encode("utf-8"), json.dumps(prompt).encode("ascii"), model=model, timeout=timeout, ollama_exec=ollama_exec)
+
+
+# Prompt templates: constant text around the user's command. Both are pre-encoded
+# once so only the command itself is encoded per call.
+_PROMPT_SUFFIX = "'\nOutput:"
+
+_DECIDER_PREFIX = (
+    "You are an assistant that converts a user's short command into a single JSON"
+    " object describing the action to take. Only output valid JSON. The JSON must"
+    " have a top-level key 'action' whose value is an object with a 'type' field"
+    " (one of: 'open_url', 'open_app', 'tell_time', 'none') and any required"
+    " arguments (for example, 'url' for open_url, 'app' for open_app). Example:\n\n"
+    "Input: 'Open GitHub in the browser'\n"
+    "Output: {\"action\": {\"type\": \"open_url\", \"url\": \"https://github.com\"}}\n\n"
+    "Input: '"
+)
+
+_EXTRACT_PREFIX = (
+    "You are a JSON extraction assistant. Given a user command, extract the "
+    "intent and any entities and return a single JSON object with the keys "
+    "\"intent\" (string) and \"entities\" (object). Only output valid JSON.\n\n"
+    "Examples:\n"
+    "Input: 'Open GitHub in the browser'\n"
+    "Output: {\"intent\": \"open_url\", \"entities\": {\"url\": \"https://github.com\"}}\n\n"
+    "Input: '"
+)
+
+
+def _encode_template(prefix: str, suffix: str = _PROMPT_SUFFIX):
+    """Pre-encode `prefix`/`suffix` as raw UTF-8 and as JSON string-literal fragments."""
+    raw = (prefix.encode("utf-8"), suffix.encode("utf-8"))
+    # JSON escaping is per character, so the literal can be split around the text
+    js = (json.dumps(prefix)[:-1].encode("ascii"), json.dumps(suffix)[1:].encode("ascii"))
+    return raw, js
+
+
+def _fill_template(template, text: str):
+    """Return (prompt bytes, prompt JSON literal bytes) with `text` inserted."""
+    (raw_pre, raw_suf), (js_pre, js_suf) = template
+    return (
+        b"".join((raw_pre, text.encode("utf-8"), raw_suf)),
+        b"".join((js_pre, json.dumps(text)[1:-1].encode("ascii"), js_suf)),
+    )
+
+
+_DECIDER_TEMPLATE = _encode_template(_DECIDER_PREFIX)
+_EXTRACT_TEMPLATE = _encode_template(_EXTRACT_PREFIX)
+
+_DEC = json.JSONDecoder()
+
+
 def _extract_json(text: str) -> Dict[str, Any]:
     """Find and parse the first JSON object in `text`. Returns {} on failure."""
-    # simple regex to find {...} block — not robust for nested braces but OK for model output
-    m = re.search(r"\{[\s\S]*\}", text)
-    if not m:
-        return {}
-    s = m.group(0)
-    try:
-        return json.loads(s)
-    except Exception:
-        return {}
+    # fast path: the model answered with bare JSON
+    if text.lstrip().startswith("{"):
+        try:
+            obj = json.loads(text)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+    # otherwise decode from each '{' in turn; raw_decode stops at the end of the
+    # object, so surrounding prose and nested braces are handled correctly
+    idx = text.find("{")
+    while idx != -1:
+        try:
+            obj, _ = _DEC.raw_decode(text, idx)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+        idx = text.find("{", idx + 1)
+    return {}
+
+
+# App mappings: prefer launching native apps or protocol URIs when available.
+# Each entry maps a short name to a dict describing how to launch it.
+# - type: 'protocol' will be opened as a URI (e.g., ms-windows-store://)
+# - type: 'app' will be launched via 'start' with the provided value
+_APP_MAP = {
+    "microsoft store": {"type": "protocol", "value": "ms-windows-store://home"},
+    "microsoft": {"type": "protocol", "value": "ms-windows-store://home"},
+    "xbox": {"type": "protocol", "value": "xbox:"},
+    "spotify": {"type": "app", "value": "spotify"},
+}
+
+# Common website mappings (fallback to opening in browser)
+_SITE_MAP = {
+    "github": "https://github.com",
+    "linkedin": "https://www.linkedin.com",
+    "xbox": "https://www.xbox.com",
+    "steam": "https://store.steampowered.com",
+}
+
+# Normalize some common mishearings
+_ALIASES = {
+    "mic store": "microsoft store",
+    "microsft store": "microsoft store",
+}
+_ALIAS_RE = re.compile("|".join(map(re.escape, sorted(_ALIASES, key=len, reverse=True))))
+
+
+def _alias_sub(m: re.Match) -> str:
+    return _ALIASES[m.group(0)]
+
+
+def _split_keys(mapping):
+    """Split `mapping` into (1-word lookup, 2-word tuple lookup) tables of (rank, value).
+
+    The rank is the entry's position in `mapping`, so a lookup can honour table order.
+    """
+    one, two = {}, {}
+    for rank, (name, value) in enumerate(mapping.items()):
+        words = tuple(name.split())
+        if len(words) == 1:
+            one[words[0]] = (rank, value)
+        elif len(words) == 2:
+            two[words] = (rank, value)
+        else:
+            raise ValueError(f"mapping key {name!r} must be one or two words")
+    return one, two
+
+
+_APP_KEYS, _APP_2GRAM = _split_keys(_APP_MAP)
+_SITE_KEYS, _SITE_2GRAM = _split_keys(_SITE_MAP)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _match_tokens(tokens, keys, bigrams):
+    """Return the value of the earliest table entry named in `tokens`, or None.
+
+    Like the per-entry regex scan this replaces, table order decides between several
+    names ("open spotify and xbox" -> xbox), not their position in the text.
+    """
+    best = None
+    for i, tok in enumerate(tokens):
+        if bigrams and i + 1 < len(tokens):
+            hit = bigrams.get((tok, tokens[i + 1]))
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        hit = keys.get(tok)
+        if hit is not None and (best is None or hit[0] < best[0]):
+            best = hit
+    return None if best is None else best[1]
 
 
 def _rule_based_parse(text: str, config: dict) -> Dict[str, Any]:
-    t = text.lower()
+    # apply aliases first (single pass over the lowered text)
+    t = _ALIAS_RE.sub(_alias_sub, text.lower())
     entities = {}
     intent = "unknown"
 
-    # App mappings: prefer launching native apps or protocol URIs when available.
-    # Each entry maps a short name to a dict describing how to launch it.
-    # - type: 'protocol' will be opened as a URI (e.g., ms-windows-store://)
-    # - type: 'app' will be launched via 'start' with the provided value
-    app_map = {
-        "microsoft store": {"type": "protocol", "value": "ms-windows-store://home"},
-        "microsoft": {"type": "protocol", "value": "ms-windows-store://home"},
-        "xbox": {"type": "protocol", "value": "xbox:"},
-        "spotify": {"type": "app", "value": "spotify"},
-    }
-
-    # Common website mappings (fallback to opening in browser)
-    site_map = {
-        "github": "https://github.com",
-        "linkedin": "https://www.linkedin.com",
-        "xbox": "https://www.xbox.com",
-        "steam": "https://store.steampowered.com",
-    }
-
-    # Normalize some common mishearings
-    aliases = {
-        "mic store": "microsoft store",
-        "microsft store": "microsoft store",
-    }
-
-    # apply aliases first
-    for a, b in aliases.items():
-        if a in t and b not in t:
-            t = t.replace(a, b)
-
     # Only consider commands that begin with/open containing 'open'
     if "open" in t:
+        # tokenize once; mapping lookups are then whole-word dict hits
+        tokens = _WORD_RE.findall(t)
         # Prefer app_map matches (exact word match) so 'microsoft store' opens the
         # Store app/protocol instead of the website.
-        for name, info in app_map.items():
-            # exact-word matching to avoid false positives
-            if re.search(r"\b" + re.escape(name) + r"\b", t):
-                intent = "open_app"
-                # return the raw info so executor can decide how to launch
-                entities["app"] = info
-                return {"intent": intent, "entities": entities}
+        app = _match_tokens(tokens, _APP_KEYS, _APP_2GRAM)
+        if app is not None:
+            intent = "open_app"
+            # return the raw info so executor can decide how to launch
+            entities["app"] = app
+            return {"intent": intent, "entities": entities}
 
         # If no app matched, fall back to known site mappings
-        for name, url in site_map.items():
-            if re.search(r"\b" + re.escape(name) + r"\b", t):
-                intent = "open_url"
-                entities["url"] = url
-                return {"intent": intent, "entities": entities}
+        url = _match_tokens(tokens, _SITE_KEYS, _SITE_2GRAM)
+        if url is not None:
+            intent = "open_url"
+            entities["url"] = url
+            return {"intent": intent, "entities": entities}
 
         # browser / edge / chrome -> open browser (app)
-        if re.search(r"\b(edge|browser)\b", t):
+        words = set(tokens)
+        if "edge" in words or "browser" in words:
             intent = "open_app"
             entities["app"] = {"type": "app", "value": "msedge"}
             return {"intent": intent, "entities": entities}
-        if re.search(r"\bchrome\b", t):
+        if "chrome" in words:
             intent = "open_app"
             entities["app"] = {"type": "app", "value": "chrome"}
             return {"intent": intent, "entities": entities}
@@ -138,53 +398,56 @@ def _rule_based_parse(text: str, config: dict) -> Dict[str, Any]:
     return {"intent": intent, "entities": entities}
 
 
+class _NoLLMResult(Exception):
+    """Raised by `_llm_parse` when the LLM gave no usable JSON, so the miss is not cached."""
+
+
+@lru_cache(maxsize=256)
+def _llm_parse(text: str, model: str, use_decider: bool, ollama_exec: str = None) -> Dict[str, Any]:
+    """Ask the LLM for a parse of `text`; results are memoized, callers must not mutate them."""
+    # Optional LLM-based decider: ask the LLM to choose an action directly.
+    if use_decider:
+        out = _call_ollama_bytes(*_fill_template(_DECIDER_TEMPLATE, text), model=model, ollama_exec=ollama_exec)
+        parsed = _extract_json(out)
+        if parsed and isinstance(parsed.get("action"), dict):
+            # wrap into same return shape: intent + entities
+            return {"intent": "execute", "entities": {"action": parsed.get("action")}}
+
+    out = _call_ollama_bytes(*_fill_template(_EXTRACT_TEMPLATE, text), model=model, ollama_exec=ollama_exec)
+    parsed = _extract_json(out)
+    if parsed and isinstance(parsed.get("intent"), str) and isinstance(parsed.get("entities", {}), dict):
+        return {"intent": parsed.get("intent"), "entities": parsed.get("entities", {})}
+    raise _NoLLMResult(text)
+
+
 def parse_intent(text: str, config: dict) -> Dict[str, Any]:
     """Return {'intent': str, 'entities': dict}.
 
-    If `config.get('use_ollama')` is True and the `ollama` CLI is present, call the
-    LLM asking for a JSON response. On failure, fall back to the rule-based parser.
+    The rule-based parser runs first; only when it returns intent 'unknown' and
+    `config.get('use_ollama')` is True with the `ollama` CLI present is the LLM asked
+    for a JSON response (on failure the rule-based result is returned). Set
+    `prefer_llm: true` to consult the LLM first, with the rule-based parser as fallback.
     """
-    # Try LLM path first when requested
+    prefer_llm = bool(config.get("prefer_llm", False))
+    if not prefer_llm:
+        parsed = _rule_based_parse(text, config)
+        if parsed["intent"] != "unknown":
+            return parsed
+
     use_llm = bool(config.get("use_ollama", False))
     model = config.get("llm_model", "phi3")
 
     # determine executable path (config can override)
     ollama_exec = config.get("ollama_path") if isinstance(config.get("ollama_path"), str) else None
-    # Optional LLM-based decider: ask the LLM to choose an action directly.
-    if config.get("use_ollama_decider", False) and use_llm and _ollama_available(ollama_exec):
-        decider_prompt = (
-            "You are an assistant that converts a user's short command into a single JSON"
-            " object describing the action to take. Only output valid JSON. The JSON must"
-            " have a top-level key 'action' whose value is an object with a 'type' field"
-            " (one of: 'open_url', 'open_app', 'tell_time', 'none') and any required"
-            " arguments (for example, 'url' for open_url, 'app' for open_app). Example:\n\n"
-            "Input: 'Open GitHub in the browser'\n"
-            "Output: {\"action\": {\"type\": \"open_url\", \"url\": \"https://github.com\"}}\n\n"
-            f"Input: '{text}'\nOutput:"
-        )
-        out = _call_ollama(decider_prompt, model=model, ollama_exec=ollama_exec)
-        parsed = _extract_json(out)
-        if parsed and isinstance(parsed.get("action"), dict):
-            # wrap into same return shape: intent + entities
-            return {"intent": "execute", "entities": {"action": parsed.get("action")}}
-
     if use_llm and _ollama_available(ollama_exec):
-        prompt = (
-            "You are a JSON extraction assistant. Given a user command, extract the "
-            "intent and any entities and return a single JSON object with the keys "
-            "\"intent\" (string) and \"entities\" (object). Only output valid JSON.\n\n"
-            "Examples:\n"
-            "Input: 'Open GitHub in the browser'\n"
-            "Output: {\"intent\": \"open_url\", \"entities\": {\"url\": \"https://github.com\"}}\n\n"
-            f"Input: '{text}'\nOutput:"
-        )
-        out = _call_ollama(prompt, model=model, ollama_exec=ollama_exec)
-        parsed = _extract_json(out)
-        if parsed and isinstance(parsed.get("intent"), str) and isinstance(parsed.get("entities", {}), dict):
-            return {"intent": parsed.get("intent"), "entities": parsed.get("entities", {})}
+        use_decider = bool(config.get("use_ollama_decider", False))
+        try:
+            return _llm_parse(text.strip().lower(), model, use_decider, ollama_exec)
+        except _NoLLMResult:
+            pass
 
     # fallback
-    return _rule_based_parse(text, config)
+    return _rule_based_parse(text, config) if prefer_llm else parsed
 
 
 def test_ollama(model: str = "phi3", sample: str = "Open GitHub in the browser") -> str:
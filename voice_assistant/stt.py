@@ -5,6 +5,11 @@ Behavior:
 - If `vosk` and `sounddevice` are installed and a model exists at the default path,
   `listen()` will capture audio from the default microphone, run the Vosk recognizer
   and return recognized text (blocking until a final result is produced).
+- The Vosk model, recognizer and microphone stream are set up on the first `listen()`
+  and reused after; `close_stream()` releases the microphone.
+- Only speech frames are passed to Vosk, and a pause after speech ends the
+  utterance. Speech is detected with `webrtcvad` if installed, otherwise with a
+  frame-energy check (JIT-compiled when `numba` is installed).
 - If the real audio stack is unavailable, `listen()` falls back to simulated stdin input
   so the rest of the skeleton remains usable.
 
@@ -13,45 +18,670 @@ Usage:
   text = stt.listen()
 
 Notes:
-- This module intentionally avoids hard failures. It prints status messages to help
-  diagnose missing dependencies or model files.
+- This module intentionally avoids hard failures. It logs status messages (to stderr
+  by default, via the `voice_assistant.stt` logger) to help diagnose missing
+  dependencies or model files.
 """
 
+from concurrent.futures import Future
+import atexit
+from functools import lru_cache
 from pathlib import Path
 import json
-import time
+import logging
+import logging.handlers
+import math
+import threading
 import queue
+import time
 import sys
 
-HAS_VOSK = False
-HAS_SD = False
+# Diagnostics go through a QueueHandler so the listen/decode threads only enqueue a
+# record; a QueueListener thread does the actual stderr writes. Both are set up on
+# the first listen(), so importing this module starts no thread. An application that
+# configures this logger itself keeps its own handlers.
+log = logging.getLogger(__name__)
+_log_listener = None
+_log_lock = threading.Lock()
 
-try:
-    from vosk import Model, KaldiRecognizer
-    HAS_VOSK = True
-except Exception:
-    Model = None
-    KaldiRecognizer = None
+
+class _StderrFallback(logging.StreamHandler):
+    """stderr output for while the application has not configured logging.
+
+    Records still propagate; once the root logger has handlers they print there, and
+    this handler stays quiet so nothing is written twice.
+    """
+
+    def emit(self, record):
+        if not logging.getLogger().handlers:
+            super().emit(record)
+
+
+def _start_logging():
+    global _log_listener
+    with _log_lock:
+        if _log_listener is not None or log.handlers:
+            return
+        q = queue.SimpleQueue()
+        stderr = _StderrFallback(sys.stderr)
+        stderr.setFormatter(logging.Formatter("[stt] %(message)s"))
+        _log_listener = logging.handlers.QueueListener(q, stderr)
+        _log_listener.start()
+        # the listener thread is a daemon; flush what is still queued on exit
+        atexit.register(_log_listener.stop)
+        log.addHandler(logging.handlers.QueueHandler(q))
+        if log.level == logging.NOTSET:
+            log.setLevel(logging.INFO)
+
+
+# vosk and sounddevice load large native libraries (Kaldi, PortAudio), so they are
+# imported on first use; HAS_VOSK / HAS_SD stay None until probed
+HAS_VOSK = None
+HAS_SD = None
+HAS_WEBRTCVAD = None
+HAS_NUMPY = None
+HAS_NUMBA = None
+HAS_ORJSON = False
+Model = None
+KaldiRecognizer = None
+sd = None
+webrtcvad = None
+np = None
 
 try:
-    import sounddevice as sd
-    HAS_SD = True
+    import orjson
+    HAS_ORJSON = True
 except Exception:
-    sd = None
+    orjson = None
+
+# full JSON parser for the Vosk results the string search in _text_from_json defers
+_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _load_vosk() -> bool:
+    """Import vosk on first call; returns HAS_VOSK."""
+    global HAS_VOSK, Model, KaldiRecognizer
+    if HAS_VOSK is None:
+        try:
+            from vosk import Model, KaldiRecognizer
+            HAS_VOSK = True
+        except Exception:
+            HAS_VOSK = False
+    return HAS_VOSK
+
+
+def _load_sd() -> bool:
+    """Import sounddevice on first call; returns HAS_SD."""
+    global HAS_SD, sd
+    if HAS_SD is None:
+        try:
+            import sounddevice as sd
+            HAS_SD = True
+        except Exception:
+            HAS_SD = False
+    return HAS_SD
+
+
+def _load_webrtcvad() -> bool:
+    """Import webrtcvad (optional speech gate) on first call; returns HAS_WEBRTCVAD."""
+    global HAS_WEBRTCVAD, webrtcvad
+    if HAS_WEBRTCVAD is None:
+        try:
+            import webrtcvad
+            HAS_WEBRTCVAD = True
+        except Exception:
+            HAS_WEBRTCVAD = False
+    return HAS_WEBRTCVAD
+
+
+def _load_numpy() -> bool:
+    """Import numpy (speech-gate buffers) on first call; returns HAS_NUMPY."""
+    global HAS_NUMPY, np
+    if HAS_NUMPY is None:
+        try:
+            import numpy as np
+            HAS_NUMPY = True
+        except Exception:
+            HAS_NUMPY = False
+    return HAS_NUMPY
+
+
+def _load_numba() -> bool:
+    """Import numba (JIT for the energy VAD) on first call; returns HAS_NUMBA."""
+    global HAS_NUMBA
+    if HAS_NUMBA is None:
+        try:
+            import numba  # noqa: F401
+            HAS_NUMBA = _load_numpy()
+        except Exception:
+            HAS_NUMBA = False
+    return HAS_NUMBA
+
+
+# mic callback block length in seconds
+_BLOCK_SEC = 0.02
+# audio handed to each AcceptWaveform call while speech continues: fewer, larger
+# native calls instead of one per 20 ms block
+_BATCH_SEC = 0.2
+
+# speech gate: 20 ms frames, webrtcvad aggressiveness 0-3, 200 ms of audio kept from
+# before speech starts, and 800 ms of silence after speech ends the utterance
+_VAD_FRAME_SEC = 0.02
+_VAD_MODE = 2
+_VAD_PREROLL = 10
+_VAD_END_FRAMES = 40
+# a partial result unchanged for this long within one continuous pause after speech
+# is committed without waiting for the full _VAD_END_FRAMES of silence
+_PARTIAL_STABLE_SEC = 0.3
+# energy VAD used without webrtcvad: a frame is speech when its mean square is over
+# _ENERGY_RATIO x the running noise floor, and never below _ENERGY_MIN (RMS 100).
+# The floor is seeded from the quietest of the first _ENERGY_SEED_FRAMES (200 ms),
+# then tracked on every frame: it drops straight to any quieter frame and rises by at
+# most _ENERGY_RISE per frame, so speech barely moves it but louder rooms catch up.
+_ENERGY_MIN = 100.0 ** 2
+_ENERGY_RATIO = 4.0
+_ENERGY_SEED_FRAMES = 10
+_ENERGY_RISE = 1.02
+
+# (model_dir, samplerate) -> (Model, KaldiRecognizer); loading a model is slow, so it
+# is done once per process. The recognizer is shared, so listen() is not re-entrant.
+_MODEL_CACHE = {}
+
+
+def _text_from_json(s: str, key: str = '"text"') -> str:
+    """Return the string value of `key` in a Vosk result without a full JSON parse.
+
+    Vosk results are flat objects whose values are plain words; anything with an
+    escape sequence falls back to the real parser.
+    """
+    i = s.find(key)
+    if i < 0:
+        return ''
+    j = s.find('"', i + len(key))
+    k = s.find('"', j + 1)
+    if j < 0 or k < 0:
+        return ''
+    value = s[j + 1:k]
+    if '\\' in value:
+        try:
+            return _loads(s).get(key.strip('"'), '').strip()
+        except Exception:
+            return ''
+    return value.strip()
+
+
+class _PcmRing:
+    """Single-producer/single-consumer byte ring between the mic callback and the recognizer.
+
+    `widx`/`ridx` are ever-growing byte counters, each written by one side only; a
+    plain int store is atomic under the GIL, so no lock is needed. The producer copies
+    first and publishes `widx` after, so the consumer never sees unwritten bytes.
+    """
+
+    def __init__(self, size: int = 1 << 17):
+        # 128 KiB = 4 s of 16 kHz int16 mono; power of two so wrapping is a mask
+        if size & (size - 1):
+            raise ValueError("ring size must be a power of two")
+        self._size = size
+        self._mask = size - 1
+        self._mv = memoryview(bytearray(size))
+        self.widx = 0
+        self.ridx = 0
+        self.ready = threading.Event()
+
+    def write(self, data):
+        """Producer side: copy `data` into the ring and wake the consumer."""
+        mv = memoryview(data).cast('B')
+        n = mv.nbytes
+        if n > self._size:
+            mv = mv[n - self._size:]
+            n = self._size
+        w = self.widx & self._mask
+        first = min(n, self._size - w)
+        self._mv[w:w + first] = mv[:first]
+        if first < n:
+            self._mv[:n - first] = mv[first:]
+        self.widx += n
+        self.ready.set()
+
+    def read(self):
+        """Consumer side: return everything written since the last read.
+
+        Contiguous audio comes back as a zero-copy memoryview into the ring (valid
+        until the producer laps it, i.e. a full ring later); audio that wraps around
+        the end is joined into bytes.
+        """
+        w = self.widx
+        # if the consumer fell a full ring behind, the oldest audio is gone
+        r = max(self.ridx, w - self._size)
+        self.ridx = w
+        if w == r:
+            return b""
+        s = r & self._mask
+        e = s + (w - r)
+        if e <= self._size:
+            return self._mv[s:e]
+        return bytes(self._mv[s:]) + bytes(self._mv[:e - self._size])
+
+
+def _pcm_buffer(samples: int):
+    """Return a zeroed int16 buffer: a numpy array when installed, else an 'h' memoryview."""
+    if _load_numpy():
+        return np.zeros(samples, dtype=np.int16)
+    return memoryview(bytearray(samples * 2)).cast('h')
+
+
+class _SpeechGate:
+    """Pass only speech frames (plus pre/post-roll) on to the recognizer.
+
+    `is_speech(frame)` classifies one `frame_samples`-long int16 frame. Silence before
+    speech is only buffered as pre-roll, so Vosk does no work on it. Pending audio,
+    pre-roll and output live in preallocated int16 buffers that are reused across feeds.
+    """
+
+    def __init__(self, is_speech, frame_samples: int):
+        self._is_speech = is_speech
+        self._fs = frame_samples
+        # ~1.3 s of pending audio at 16 kHz; grown if a single read brings more
+        cap = frame_samples * 64
+        self._pcm = _pcm_buffer(cap)
+        self._n = 0
+        # circular pre-roll of _VAD_PREROLL frames
+        self._pre = _pcm_buffer(frame_samples * _VAD_PREROLL)
+        self._pre_head = 0
+        self._pre_count = 0
+        self._out = _pcm_buffer(cap + frame_samples * _VAD_PREROLL)
+        self.in_speech = False
+        self.silent_run = 0
+
+    def _reserve(self, samples: int):
+        need = self._n + samples
+        if need > len(self._pcm):
+            cap = max(need, 2 * len(self._pcm))
+            pcm = _pcm_buffer(cap)
+            pcm[:self._n] = self._pcm[:self._n]
+            self._pcm = pcm
+            self._out = _pcm_buffer(cap + self._fs * _VAD_PREROLL)
+
+    def _flush_preroll(self, m: int) -> int:
+        """Copy the buffered pre-roll, oldest first, to the output at `m`; returns the new end."""
+        fs = self._fs
+        first = (self._pre_head - self._pre_count) % _VAD_PREROLL
+        for j in range(self._pre_count):
+            s = (first + j) % _VAD_PREROLL * fs
+            self._out[m:m + fs] = self._pre[s:s + fs]
+            m += fs
+        self._pre_count = 0
+        return m
+
+    def feed(self, data):
+        """Return (audio for the recognizer, True if trailing silence ended an utterance).
+
+        The audio is a view into the gate's output buffer, valid until the next feed.
+        """
+        x = memoryview(data).cast('B').cast('h')
+        k = len(x)
+        self._reserve(k)
+        pcm = self._pcm
+        pcm[self._n:self._n + k] = x
+        self._n += k
+        fs = self._fs
+        out = self._out
+        m = 0
+        ended = False
+        full = self._n - self._n % fs
+        for i in range(0, full, fs):
+            frame = pcm[i:i + fs]
+            if self._is_speech(frame):
+                if not self.in_speech:
+                    self.in_speech = True
+                    m = self._flush_preroll(m)
+                self.silent_run = 0
+                out[m:m + fs] = frame
+                m += fs
+            elif self.in_speech:
+                # keep feeding silence as post-roll until the utterance is over
+                out[m:m + fs] = frame
+                m += fs
+                self.silent_run += 1
+                if self.silent_run >= _VAD_END_FRAMES:
+                    self.in_speech = False
+                    self.silent_run = 0
+                    ended = True
+            else:
+                h = self._pre_head
+                self._pre[h * fs:(h + 1) * fs] = frame
+                self._pre_head = (h + 1) % _VAD_PREROLL
+                self._pre_count = min(self._pre_count + 1, _VAD_PREROLL)
+        # keep the incomplete trailing frame for the next feed
+        rest = self._n - full
+        if full and rest:
+            pcm[:rest] = pcm[full:self._n]
+        self._n = rest
+        if not m:
+            return b"", ended
+        return memoryview(out[:m]).cast('B'), ended
+
+
+def _py_frame_energy(pcm, start: int, n: int) -> float:
+    """Mean square of pcm[start:start + n] (int16 samples)."""
+    frame = pcm[start:start + n]
+    if _sumprod is not None:
+        # C-level dot product straight over the 'h' memoryview
+        return _sumprod(frame, frame) / n
+    s = 0
+    for v in frame:
+        s += v * v
+    return s / n
+
+
+# math.sumprod is Python 3.12+
+_sumprod = getattr(math, "sumprod", None)
+
+
+_frame_energy = None
+
 
+def _get_frame_energy():
+    """Pick the fastest mean-square kernel available: numba, then numpy, then Python."""
+    global _frame_energy
+    if _frame_energy is None:
+        if _load_numba():
+            from numba import njit
 
+            @njit(cache=True, fastmath=True)
+            def frame_energy(pcm, start, n):
+                s = 0.0
+                for i in range(n):
+                    v = float(pcm[start + i])
+                    s += v * v
+                return s / n
+
+            _frame_energy = frame_energy
+        elif _load_numpy():
+            def frame_energy(pcm, start, n):
+                v = pcm[start:start + n].astype(np.float32)
+                return float(np.dot(v, v)) / n
+
+            _frame_energy = frame_energy
+        else:
+            _frame_energy = _py_frame_energy
+    return _frame_energy
+
+
+def _energy_vad():
+    """Return an is_speech(frame) that compares frame energy with a tracked noise floor."""
+    frame_energy = _get_frame_energy()
+    floor = None
+    seen = 0
+
+    def is_speech(frame) -> bool:
+        nonlocal floor, seen
+        e = frame_energy(frame, 0, len(frame))
+        if seen < _ENERGY_SEED_FRAMES:
+            # learn the room first; these frames still reach the recognizer through
+            # the gate's pre-roll if speech starts right away
+            seen += 1
+            floor = e if floor is None else min(floor, e)
+            return False
+        speech = e > max(_ENERGY_MIN, floor * _ENERGY_RATIO)
+        # track the floor on every frame, speech or not: updating it only on frames
+        # already judged silent would leave it stuck below a noisy room for good
+        # (a seed taken while the user was already talking is undone by the first pause)
+        floor = min(e, floor * _ENERGY_RISE)
+        return speech
+
+    return is_speech
+
+
+def _webrtc_vad(samplerate: int):
+    """Return an is_speech(frame) backed by webrtcvad."""
+    vad = webrtcvad.Vad(_VAD_MODE)
+    # webrtcvad wants a read-only buffer; a read-only byte view of the int16 frame
+    # avoids copying it to bytes, with the copy kept for builds that insist on bytes
+    zero_copy = True
+
+    def is_speech(frame) -> bool:
+        nonlocal zero_copy
+        if zero_copy:
+            try:
+                return vad.is_speech(memoryview(frame).cast('B').toreadonly(), samplerate)
+            except TypeError:
+                zero_copy = False
+        return vad.is_speech(bytes(frame), samplerate)
+
+    return is_speech
+
+
+def _make_gate(samplerate: int):
+    """Return a _SpeechGate for `samplerate`: webrtcvad when installed, else the energy VAD."""
+    frame_samples = int(samplerate * _VAD_FRAME_SEC)
+    # webrtcvad only handles these rates
+    if samplerate in (8000, 16000, 32000, 48000) and _load_webrtcvad():
+        return _SpeechGate(_webrtc_vad(samplerate), frame_samples)
+    return _SpeechGate(_energy_vad(), frame_samples)
+
+
+@lru_cache(maxsize=1)
 def default_model_path():
-    # default to a sibling folder in the project root
+    # default to a sibling folder in the project root; resolve() touches the
+    # filesystem, so the result is computed once
     p = Path(__file__).resolve().parent.parent / "vosk-model-en-in-0.5"
     return p
 
 
+# model dir -> (monotonic time checked, exists); model folders don't come and go
+# during a session, so the stat is repeated at most every _EXISTS_TTL seconds
+_EXISTS_TTL = 5.0
+_EXISTS_CACHE = {}
+
+
+def _model_exists(model_dir: Path) -> bool:
+    now = time.monotonic()
+    cached = _EXISTS_CACHE.get(model_dir)
+    if cached is not None and now - cached[0] < _EXISTS_TTL:
+        return cached[1]
+    exists = model_dir.exists()
+    _EXISTS_CACHE[model_dir] = (now, exists)
+    return exists
+
+
+# cached result of available(); None means "probe on next call"
+_AVAILABLE = None
+
+
 def available():
-    """Return True if a real Vosk+sounddevice STT pipeline is available."""
-    if not HAS_VOSK or not HAS_SD:
-        return False
-    model_path = default_model_path()
-    return model_path.exists()
+    """Return True if a real Vosk+sounddevice STT pipeline is available.
+
+    The probe result is cached; call `invalidate_availability()` to re-check
+    (e.g. after a model download or microphone hot-plug).
+    """
+    global _AVAILABLE
+    if _AVAILABLE is None:
+        # check the model folder first so a missing model never loads the native libs
+        _AVAILABLE = _model_exists(default_model_path()) and _load_vosk() and _load_sd()
+    return _AVAILABLE
+
+
+def invalidate_availability():
+    """Forget the cached `available()` result and model-folder checks so the next call probes again."""
+    global _AVAILABLE
+    _AVAILABLE = None
+    _EXISTS_CACHE.clear()
+
+
+# whether rec.AcceptWaveform takes any buffer; cleared the first time the binding
+# rejects a memoryview, after which views are copied to bytes
+_ACCEPTS_BUFFER = True
+
+
+def _accept(rec, data) -> bool:
+    """AcceptWaveform without copying `data` when the vosk binding allows it."""
+    global _ACCEPTS_BUFFER
+    if _ACCEPTS_BUFFER and not isinstance(data, bytes):
+        try:
+            return rec.AcceptWaveform(data)
+        except TypeError:
+            _ACCEPTS_BUFFER = False
+    return rec.AcceptWaveform(bytes(data))
+
+
+def _decode_worker(ring: _PcmRing, rec, gate, timeout, stop: threading.Event, result: Future, batch_bytes: int = 0):
+    """Feed audio from `ring` to `rec` until a final result, `timeout` or `stop`.
+
+    With a speech `gate`, only speech reaches `rec`, and a long enough pause after
+    speech finalizes the utterance. Audio is handed to `rec` in batches of at least
+    `batch_bytes` while speech continues, and flushed before any partial/final result
+    is read. Runs on a dedicated thread; the recognized text (or error) is set on
+    `result`.
+    """
+    try:
+        start = time.time()
+        # partial text seen in the current pause, and the silent_run it was first seen at
+        last_partial = ''
+        partial_since = 0
+        pending = bytearray()
+        while True:
+            # clear before reading so a write landing mid-read re-sets it; check `stop`
+            # after clearing so a stop signalled just before is not slept through
+            ring.ready.clear()
+            if stop.is_set():
+                break
+            data = ring.read()
+            if data:
+                ended = False
+                if gate is not None:
+                    data, ended = gate.feed(data)
+                if data:
+                    pending += data
+                paused = gate is not None and gate.in_speech and gate.silent_run
+                if pending and (ended or paused or len(pending) >= batch_bytes):
+                    final = _accept(rec, pending)
+                    pending.clear()
+                    if final:
+                        result.set_result(_text_from_json(rec.Result()))
+                        return
+                if ended:
+                    text = _text_from_json(rec.FinalResult())
+                    # an empty result was just noise; keep listening
+                    if text:
+                        result.set_result(text)
+                        return
+                elif paused:
+                    # paused after speech: once the partial has stayed the same through
+                    # _PARTIAL_STABLE_SEC of one continuous pause, the utterance is done
+                    partial = _text_from_json(rec.PartialResult(), '"partial"')
+                    if partial != last_partial:
+                        last_partial = partial
+                        partial_since = gate.silent_run
+                    elif partial and (gate.silent_run - partial_since) * _VAD_FRAME_SEC >= _PARTIAL_STABLE_SEC:
+                        result.set_result(_text_from_json(rec.FinalResult()) or partial)
+                        return
+                if gate is not None and not gate.silent_run:
+                    # speech resumed (or the utterance ended): the next pause starts over
+                    last_partial = ''
+                    partial_since = 0
+            # partial results available via rec.PartialResult() if needed
+            if timeout is not None:
+                remaining = timeout - (time.time() - start)
+                if remaining <= 0:
+                    if pending and _accept(rec, pending):
+                        result.set_result(_text_from_json(rec.Result()))
+                        return
+                    # try to get final from remaining buffer
+                    result.set_result(_text_from_json(rec.FinalResult()))
+                    return
+                ring.ready.wait(remaining)
+            else:
+                ring.ready.wait()
+        result.set_result('')
+    except BaseException as e:
+        result.set_exception(e)
+
+
+# one microphone stream per process, kept open between listen() calls so PortAudio
+# setup is paid once; audio is only kept while _RECORDING is set
+_STREAM = None
+_STREAM_RATE = None
+_RING = None
+_RECORDING = threading.Event()
+
+
+def _open_stream(samplerate: int) -> _PcmRing:
+    """Start (or reuse) the shared input stream at `samplerate`; returns its ring."""
+    global _STREAM, _STREAM_RATE, _RING
+    if _STREAM is not None and _STREAM_RATE == samplerate and _STREAM.active:
+        return _RING
+    close_stream()
+    ring = _PcmRing()
+
+    def callback(indata, frames, time_info, status):
+        # indata is a memoryview or numpy array depending on the build; the
+        # callback only copies into the preallocated ring, no allocation
+        if _RECORDING.is_set():
+            ring.write(indata)
+
+    # small (20 ms) blocks: Vosk sees audio as it arrives instead of every 0.5 s
+    stream = sd.RawInputStream(samplerate=samplerate, blocksize=int(samplerate * _BLOCK_SEC), dtype='int16', channels=1, callback=callback)
+    stream.start()
+    if _STREAM_RATE is None:
+        atexit.register(close_stream)
+    _STREAM, _STREAM_RATE, _RING = stream, samplerate, ring
+    return ring
+
+
+def close_stream():
+    """Close the shared microphone stream; the next `listen()` reopens it."""
+    global _STREAM
+    if _STREAM is not None:
+        try:
+            _STREAM.close()
+        except Exception:
+            pass
+        _STREAM = None
+
+
+# lines read by the stdin reader thread; '' marks EOF and is never consumed
+_STDIN_LINES = None
+_STDIN_LOCK = threading.Lock()
+
+
+def _stdin_reader(lines) -> None:
+    while True:
+        try:
+            line = sys.stdin.readline()
+        except (OSError, ValueError, EOFError):
+            line = ''
+        lines.put(line)
+        if not line:
+            return
+
+
+def _read_stdin_line(timeout: float = None) -> str:
+    """Return the next stdin line, or None if none arrives within `timeout` seconds.
+
+    Selecting on the descriptor misses lines already pulled into sys.stdin's buffer
+    (and can't be done on Windows), so a timed read hands readline() to a daemon
+    thread and waits on its queue; a line that arrives late is kept for the next
+    call. Untimed reads go straight to stdin until that thread exists.
+    """
+    global _STDIN_LINES
+    if _STDIN_LINES is None:
+        if timeout is None:
+            return sys.stdin.readline()
+        with _STDIN_LOCK:
+            if _STDIN_LINES is None:
+                lines = queue.Queue()
+                threading.Thread(target=_stdin_reader, args=(lines,), name="stt-stdin", daemon=True).start()
+                _STDIN_LINES = lines
+    try:
+        line = _STDIN_LINES.get(timeout=timeout)
+    except queue.Empty:
+        return None
+    if not line:
+        # keep EOF visible to later calls
+        _STDIN_LINES.put(line)
+    return line
 
 
 def listen(model_path: str = None, samplerate: int = 16000, timeout: float = None, status_cb=None) -> str:
@@ -59,65 +689,66 @@ def listen(model_path: str = None, samplerate: int = 16000, timeout: float = Non
 
     - If Vosk+sounddevice and a model are available, stream from mic until a final
       result is produced and return it.
-    - Otherwise fall back to reading a line from stdin (simulated mic).
+    - Otherwise fall back to reading a line from stdin (simulated mic); `timeout`
+      applies there too, returning '' if no line arrives in time.
 
     Arguments:
       model_path: path to vosk model directory (optional)
       samplerate: audio sample rate (default 16000)
       timeout: optional maximum seconds to wait; None means block until a result
     """
+    if _log_listener is None:
+        _start_logging()
     # prefer real STT when possible
     model_dir = Path(model_path) if model_path else default_model_path()
-    if HAS_VOSK and HAS_SD and model_dir.exists():
+    if _model_exists(model_dir) and _load_vosk() and _load_sd():
         try:
-            if status_cb:
-                try:
-                    status_cb("loading")
-                except Exception:
-                    pass
-            print(f"[stt] Loading Vosk model from: {str(model_dir)}")
-            model = Model(str(model_dir))
-            rec = KaldiRecognizer(model, samplerate)
-            q = queue.Queue()
-
-            def callback(indata, frames, time_info, status):
-                # indata is a memoryview or numpy array depending on the build
-                q.put(bytes(indata))
-
-            stream = sd.RawInputStream(samplerate=samplerate, blocksize=8000, dtype='int16', channels=1, callback=callback)
-            with stream:
-                start = time.time()
+            key = (str(model_dir), samplerate)
+            cached = _MODEL_CACHE.get(key)
+            if cached is None:
                 if status_cb:
                     try:
-                        status_cb("listening")
+                        status_cb("loading")
                     except Exception:
                         pass
-                print("[stt] Listening (press Ctrl+C to cancel)...")
-                while True:
+                log.info("Loading Vosk model from: %s", model_dir)
+                model = Model(str(model_dir))
+                rec = KaldiRecognizer(model, samplerate)
+                _MODEL_CACHE[key] = (model, rec)
+            else:
+                # reuse the loaded model; just drop any state left from the last call
+                model, rec = cached
+                rec.Reset()
+            ring = _open_stream(samplerate)
+            # start from fresh audio, not whatever was captured before this call
+            ring.ridx = ring.widx
+            _RECORDING.set()
+            try:
+                if status_cb:
                     try:
-                        data = q.get()
-                    except KeyboardInterrupt:
-                        raise
-                    if rec.AcceptWaveform(data):
-                        res = rec.Result()
-                        try:
-                            j = json.loads(res)
-                            text = j.get('text', '').strip()
-                        except Exception:
-                            text = ''
-                        return text
-                    else:
-                        # partial results available via rec.PartialResult() if needed
-                        if timeout is not None and (time.time() - start) > timeout:
-                            # try to get final from remaining buffer
-                            final = rec.FinalResult()
-                            try:
-                                j = json.loads(final)
-                                return j.get('text', '').strip()
-                            except Exception:
-                                return ''
+                        status_cb("listening")
+                    except Exception:
+                        pass
+                log.info("Listening (press Ctrl+C to cancel)...")
+                # decoding runs on its own thread so a slow AcceptWaveform never stalls
+                # this one; the mic callback only ever touches the ring
+                result = Future()
+                stop = threading.Event()
+                worker = threading.Thread(target=_decode_worker, args=(ring, rec, _make_gate(samplerate), timeout, stop, result, int(samplerate * _BATCH_SEC) * 2), name="stt-decode", daemon=True)
+                worker.start()
+                try:
+                    return result.result()
+                finally:
+                    # on Ctrl+C, stop the worker before the shared recognizer is reused
+                    stop.set()
+                    ring.ready.set()
+                    worker.join()
+            finally:
+                _RECORDING.clear()
         except Exception as e:
-            print(f"[stt] Vosk listen failed: {e}")
+            log.warning("Vosk listen failed: %s", e)
+            # the device may be gone; reopen it on the next call
+            close_stream()
 
     # fallback to simulated input
     try:
@@ -127,7 +758,7 @@ def listen(model_path: str = None, samplerate: int = 16000, timeout: float = Non
             except Exception:
                 pass
         print("(simulated mic) ", end='', flush=True)
-        line = sys.stdin.readline()
+        line = _read_stdin_line(timeout)
         if not line:
             return ''
         return line.strip()
@@ -142,5 +773,5 @@ def simulate(text: str) -> str:
 
 if __name__ == '__main__':
     # quick local test: print availability and optionally run a short listen
-    print('VOSK available:', HAS_VOSK, 'sounddevice available:', HAS_SD)
+    print('VOSK available:', _load_vosk(), 'sounddevice available:', _load_sd())
     print('Model exists at default path:', default_model_path().exists())
@@ -6,45 +6,129 @@ Usage:
   tts.speak("Hello world")
 
 If `pyttsx3` is not installed, `speak()` will print a dry-run message.
+
+Speech runs on a background thread that owns the pyttsx3 engine, so `speak()`
+returns immediately unless called with `blocking=True`.
 """
 from typing import Optional
+import atexit
+import queue
+import threading
+import time
 
-HAS_PYTTSX3 = False
+# pyttsx3 pulls in the platform speech stack, so it is imported on first speak();
+# HAS_PYTTSX3 stays None until probed
+HAS_PYTTSX3 = None
 engine = None
+pyttsx3 = None
+
 
-try:
-    import pyttsx3
-    HAS_PYTTSX3 = True
-except Exception:
-    pyttsx3 = None
+def _load_pyttsx3() -> bool:
+    """Import pyttsx3 on first call; returns HAS_PYTTSX3."""
+    global HAS_PYTTSX3, pyttsx3
+    if HAS_PYTTSX3 is None:
+        try:
+            import pyttsx3
+            HAS_PYTTSX3 = True
+        except Exception:
+            HAS_PYTTSX3 = False
+    return HAS_PYTTSX3
 
 
 def _init_engine():
     global engine
-    if engine is None and HAS_PYTTSX3:
+    if engine is None and _load_pyttsx3():
         engine = pyttsx3.init()
     return engine
 
 
-def speak(text: str, blocking: bool = True) -> None:
-    """Speak `text` using pyttsx3 when available, otherwise print a dry-run message.
+# lines spoken within this window of each other are sent to the engine together
+_COALESCE_SEC = 0.02
 
-    This function never raises on missing optional dependencies — it falls back.
-    """
-    if not text:
-        return
-    if HAS_PYTTSX3:
+# (text, done event or None) items for the speech thread; None stops it
+_tts_q = queue.SimpleQueue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _tts_worker():
+    # the engine is created and driven from this thread only (pyttsx3 drivers are
+    # thread-affine), and stays warm between utterances
+    while True:
+        item = _tts_q.get()
+        if item is None:
+            return
+        batch, stopping = _collect_batch(item)
         try:
             eng = _init_engine()
-            eng.say(text)
-            if blocking:
-                eng.runAndWait()
+            # all queued lines share one engine run loop instead of one each
+            for text, _ in batch:
+                eng.say(text)
+            eng.runAndWait()
         except Exception as e:
             print(f"[TTS error] {e}")
+        finally:
+            for _, done in batch:
+                if done is not None:
+                    done.set()
+        if stopping:
+            return
+
+
+def _collect_batch(first):
+    """Gather lines queued within _COALESCE_SEC of `first`; returns (batch, stop seen)."""
+    batch = [first]
+    deadline = time.monotonic() + _COALESCE_SEC
+    # a blocking caller is waiting on the last line; speak without further delay
+    while batch[-1][1] is None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = _tts_q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if item is None:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = threading.Thread(target=_tts_worker, name="tts", daemon=True)
+                _worker.start()
+                atexit.register(_shutdown)
+
+
+def _shutdown(timeout: float = 10.0):
+    """Let queued speech finish (up to `timeout` seconds) before the process exits."""
+    _tts_q.put(None)
+    _worker.join(timeout)
+
+
+def speak(text: str, blocking: bool = False) -> None:
+    """Speak `text` using pyttsx3 when available, otherwise print a dry-run message.
+
+    Queues the text for the speech thread and returns; with `blocking=True`, waits
+    until it has been spoken. This function never raises on missing optional
+    dependencies — it falls back.
+    """
+    if not text:
+        return
+    if _load_pyttsx3():
+        _ensure_worker()
+        done = threading.Event() if blocking else None
+        _tts_q.put((text, done))
+        if done is not None:
+            done.wait()
     else:
         # dry-run: print to stdout so tests and CI can see it
         print(f"[TTS dry-run] {text}")
 
 
 if __name__ == '__main__':
-    speak('This is a test of the emergency broadcast system.')
+    speak('This is a test of the emergency broadcast system.', blocking=True)